@@ -0,0 +1,133 @@
+import json
+import os
+import sys
+import time
+
+from demand_store import DemandStore, normalize_string, company_level_response, demand_index_response
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+DEMAND_DATA_JSON_PATH = os.path.join(script_dir, "demand_data.json")
+
+
+def legacy_demand_index(demand_data, company, model, transmission=None, ownership=None, year=None, fuel_type=None,
+                        year_min=None, year_max=None, similar_models=True):
+    """The original list-of-dict scans from /demand-index, plus the year_min/year_max bounds.
+
+    similar_models=False skips the original fallback to every model containing
+    the first word, unfiltered; DemandStore replaced it with a ranked match
+    that only applies to model names the company doesn't have.
+    """
+    company_norm = normalize_string(company)
+    model_norm = normalize_string(model)
+
+    matches = [car for car in demand_data if car['company'] == company_norm and car['car_model'] == model_norm]
+    if transmission:
+        transmission_norm = normalize_string(transmission)
+        matches = [car for car in matches if car.get('transmission') == transmission_norm]
+    if ownership:
+        try:
+            ownership_num = int(ownership)
+            matches = [car for car in matches if car.get('owners') == ownership_num]
+        except (ValueError, TypeError):
+            pass
+    if year:
+        matches = [car for car in matches if abs(car.get('year', 0) - year) <= 2]
+    if year_min is not None:
+        matches = [car for car in matches if car.get('year', 0) >= year_min]
+    if year_max is not None:
+        matches = [car for car in matches if car.get('year', 0) <= year_max]
+    if fuel_type:
+        fuel_norm = normalize_string(fuel_type)
+        matches = [car for car in matches if car.get('fuel_type') == fuel_norm]
+
+    if not matches and similar_models:
+        company_cars = [car for car in demand_data if car['company'] == company_norm]
+        if company_cars:
+            model_search = model_norm.split()[0] if model_norm.split() else model_norm
+            similar_models = [car for car in company_cars if model_search in car.get('car_model', '')]
+            if similar_models:
+                matches = similar_models
+
+    if not matches:
+        company_cars = [car for car in demand_data if car['company'] == company_norm]
+        if company_cars:
+            return company_level_response(company, model, transmission, ownership, len(company_cars))
+
+    company_cars = [car for car in demand_data if car['company'] == company_norm]
+    model_counts = {}
+    for car in company_cars:
+        model_name = car.get('car_model', '')
+        model_counts[model_name] = model_counts.get(model_name, 0) + 1
+    max_count_in_company = max(model_counts.values()) if model_counts else 1
+
+    years = [car.get('year', 0) for car in matches if car.get('year')]
+    avg_year = sum(years) / len(years) if years else None
+    return demand_index_response(
+        company, model, transmission, ownership, len(matches), avg_year, max_count_in_company, len(company_cars)
+    )
+
+
+def build_queries(demand_data):
+    """Exact, filtered, fuzzy and unknown queries drawn from the dataset"""
+    pairs = sorted({(car['company'], car['car_model']) for car in demand_data})
+    queries = []
+    for i, (company, model) in enumerate(pairs):
+        queries.append((company, model, None, None, None, None))
+        queries.append((company.title(), model.upper(), "Manual", "1", 2015, "petrol"))
+        queries.append((company, model, "automatic", None, 2010 + i % 12, None))
+        queries.append((company, model.split()[0] + " plus", None, "2", None, "diesel"))
+        queries.append((company, model, None, None, 2016 if i % 2 else None, None, 2010 + i % 8, 2014 + i % 9))
+    queries.append(("maruti", "unknown-model", None, None, None, None))
+    queries.append(("unknown-company", "swift", None, None, None, None))
+    queries.append(("hyundai", "i20", None, "not-a-number", 0, ""))
+    return queries
+
+
+def time_queries(fn, queries):
+    start = time.perf_counter()
+    for query in queries:
+        fn(*query)
+    return (time.perf_counter() - start) / len(queries) * 1e3
+
+
+def benchmark_demand_index(scales=(1, 10, 100)):
+    """Check the columnar index against the legacy scans, then time both at several dataset sizes"""
+    print(f"Loading demand data from {DEMAND_DATA_JSON_PATH}...")
+    with open(DEMAND_DATA_JSON_PATH, 'r') as f:
+        demand_data = json.load(f)
+    print(f"Loaded {len(demand_data)} records")
+
+    queries = build_queries(demand_data)
+    store = DemandStore.from_records(demand_data)
+    fuzzy = 0
+    for query in queries:
+        actual = store.demand_index(*query)
+        # Fuzzy matches pick one ranked model instead of every model containing the first word
+        if "matched_model" in actual:
+            fuzzy += 1
+            continue
+        expected = legacy_demand_index(demand_data, *query, similar_models=False)
+        assert expected == actual, f"Responses differ for {query}:\n{expected}\n{actual}"
+    print(f"✅ Columnar index matches the legacy endpoint on {len(queries) - fuzzy} queries ({fuzzy} fuzzy matches skipped)")
+
+    # Time a mix of exact, filtered and fuzzy queries plus the unknown ones
+    queries = queries[:400] + queries[-3:]
+
+    for scale in scales:
+        data = demand_data * scale
+        start = time.perf_counter()
+        store = DemandStore.from_records(data)
+        build_s = time.perf_counter() - start
+
+        # The legacy scans are slow on large data, so time them on fewer queries
+        legacy_queries = queries[:max(5, 200 // scale)]
+        legacy_ms = time_queries(lambda *q: legacy_demand_index(data, *q), legacy_queries)
+        store_ms = time_queries(store.demand_index, queries)
+
+        print(f"\n{scale}x ({len(data)} records, index built in {build_s:.2f}s):")
+        print(f"  list-of-dict scans: {legacy_ms:8.3f} ms/request")
+        print(f"  columnar index:     {store_ms:8.3f} ms/request ({legacy_ms / store_ms:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    benchmark_demand_index(tuple(int(arg) for arg in sys.argv[1:]) or (1, 10, 100))
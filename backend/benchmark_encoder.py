@@ -0,0 +1,76 @@
+import os
+import pickle
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from feature_encoder import FeatureEncoder
+
+warnings.filterwarnings("ignore", message="X does not have valid feature names")
+
+SAMPLE_REQUEST = {
+    "company": "hyundai",
+    "car_model": "i20",
+    "year": 2018,
+    "kms_driven": 40000.0,
+    "fuel_type": "petrol",
+    "transmission": "manual",
+    "owners": 1,
+    "service_history": False,
+    "previous_accidents": False,
+    "insurance": "unknown"
+}
+
+
+def legacy_encode(model, input_data):
+    """The original /predict encoding path"""
+    X = pd.get_dummies(pd.DataFrame([input_data]))
+    return X.reindex(columns=model.feature_names_in_, fill_value=0)
+
+
+def time_per_call(fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def benchmark_encoder(model_path=None, iterations=2000):
+    """Compare per-request latency of the legacy encoding path and FeatureEncoder"""
+    if model_path is None:
+        model_path = os.path.join(os.path.dirname(__file__), "CarPriceModel.pkl")
+
+    print(f"Loading model from {model_path}...")
+    with open(model_path, "rb") as f:
+        model = pickle.load(f)
+
+    encoder = FeatureEncoder.from_model(model)
+    print(f"Encoder columns: {encoder.n_features}")
+
+    # Check both paths produce identical features and predictions
+    legacy_X = legacy_encode(model, SAMPLE_REQUEST)
+    encoder_X = encoder.encode_many([SAMPLE_REQUEST])
+    assert np.array_equal(legacy_X.to_numpy(dtype=np.float64), encoder_X), "Encoded features differ"
+    assert model.predict(legacy_X)[0] == model.predict(encoder_X)[0], "Predictions differ"
+    print("✅ Encoder output matches get_dummies/reindex")
+
+    legacy_encode_us = time_per_call(lambda: legacy_encode(model, SAMPLE_REQUEST), iterations)
+    encoder_encode_us = time_per_call(lambda: encoder.encode_many([SAMPLE_REQUEST]), iterations)
+
+    predict_iterations = max(1, iterations // 10)
+    legacy_total_us = time_per_call(lambda: model.predict(legacy_encode(model, SAMPLE_REQUEST)), predict_iterations)
+    encoder_total_us = time_per_call(lambda: model.predict(encoder.encode_many([SAMPLE_REQUEST])), predict_iterations)
+
+    print(f"\nEncoding only ({iterations} iterations):")
+    print(f"  get_dummies/reindex: {legacy_encode_us:10.1f} µs/request")
+    print(f"  FeatureEncoder:      {encoder_encode_us:10.1f} µs/request ({legacy_encode_us / encoder_encode_us:.0f}x faster)")
+    print(f"\nEncode + predict ({predict_iterations} iterations):")
+    print(f"  get_dummies/reindex: {legacy_total_us:10.1f} µs/request")
+    print(f"  FeatureEncoder:      {encoder_total_us:10.1f} µs/request")
+
+
+if __name__ == "__main__":
+    benchmark_encoder(sys.argv[1] if len(sys.argv) > 1 else None)
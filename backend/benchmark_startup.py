@@ -0,0 +1,128 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Budgets checked in CI; the script exits 1 when either is exceeded
+MAX_IMPORT_SECONDS = float(os.getenv("STARTUP_MAX_IMPORT_SECONDS", "1.0"))
+MAX_READY_SECONDS = float(os.getenv("STARTUP_MAX_READY_SECONDS", "15"))
+# Modules that must not be imported by `import main`
+LAZY_MODULES = ("pandas", "requests", "sklearn", "pyarrow")
+
+
+def import_breakdown(top=15):
+    """Run `python -X importtime -c "import main"` and return (total_us, slowest rows, eagerly imported lazy modules)"""
+    check = f"import sys, main; print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", check],
+        cwd=script_dir, capture_output=True, text=True, check=True
+    )
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+
+    main_rows = [row for row in rows if row[2].strip() == "main"]
+    total_us = main_rows[-1][1] if main_rows else sum(row[0] for row in rows)
+    slowest = sorted(rows, key=lambda row: row[1], reverse=True)[:top]
+    eager = [m for m in result.stdout.strip().split(",") if m]
+    return total_us, slowest, eager
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def get(url):
+    """Return (status, JSON body) for a GET, or (None, None) while the server is not accepting connections"""
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+    except (urllib.error.URLError, ConnectionError):
+        return None, None
+
+
+def time_to_ready(timeout=60.0):
+    """Start uvicorn and time the first served request and the first 200 from /ready.
+
+    Returns (first_response_s, ready_s, artifacts); ready_s is None if a
+    critical artifact failed or the timeout passed.
+    """
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/ready"
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=script_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    first_response_s = ready_s = None
+    artifacts = {}
+    try:
+        while time.perf_counter() - start < timeout and server.poll() is None:
+            status, body = get(url)
+            if status is not None and first_response_s is None:
+                first_response_s = time.perf_counter() - start
+            if status == 200:
+                ready_s = time.perf_counter() - start
+                artifacts = body["artifacts"]
+                break
+            if status == 503:
+                artifacts = body["detail"]["artifacts"]
+                if any(artifact["status"] == "failed" for artifact in artifacts.values()):
+                    break
+            time.sleep(0.02)
+    finally:
+        server.terminate()
+        server.wait(10)
+    return first_response_s, ready_s, artifacts
+
+
+def benchmark_startup():
+    """Report import-time and time-to-ready breakdowns and check them against the budgets"""
+    failures = []
+
+    total_us, slowest, eager = import_breakdown()
+    print(f"import main: {total_us / 1e6:.3f}s (budget {MAX_IMPORT_SECONDS:.3f}s)")
+    print(f"\n{'self [ms]':>10} {'cumulative [ms]':>16}  module")
+    for self_us, cumulative_us, name in slowest:
+        print(f"{self_us / 1e3:10.1f} {cumulative_us / 1e3:16.1f}  {name}")
+    if total_us / 1e6 > MAX_IMPORT_SECONDS:
+        failures.append(f"import main took {total_us / 1e6:.3f}s")
+    if eager:
+        failures.append(f"import main pulled in {', '.join(eager)}")
+
+    first_response_s, ready_s, artifacts = time_to_ready()
+    print(f"\nFirst served request: {first_response_s:.2f}s" if first_response_s is not None else "\nServer never responded")
+    for name, artifact in artifacts.items():
+        seconds = f"{artifact['seconds']:.3f}s" if artifact["seconds"] is not None else "-"
+        print(f"  {name:<16} {artifact['status']:<8} {seconds}")
+    if ready_s is None:
+        failures.append("app never became ready")
+    else:
+        print(f"Ready: {ready_s:.2f}s (budget {MAX_READY_SECONDS:.1f}s)")
+        if ready_s > MAX_READY_SECONDS:
+            failures.append(f"app took {ready_s:.2f}s to become ready")
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        return 1
+    print("✅ Startup within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(benchmark_startup())
@@ -0,0 +1,65 @@
+import json
+import os
+import pickle
+import sys
+import time
+import warnings
+
+import main
+from demand_cube import build_cube
+from demand_store import DemandStore
+from model_loader import build_feature_encoder, build_flat_forest, file_version
+from serving_bundle import ServingBundle, save_bundle
+
+warnings.filterwarnings("ignore", message="X does not have valid feature names")
+
+# Pack the model, encoder, catalogs and demand indices into one mappable file for the API
+bundle_path = sys.argv[1] if len(sys.argv) > 1 else main.SERVING_BUNDLE_PATH
+sources = main.bundle_sources()
+
+print(f"Loading model from {sources['model']}...")
+with open(sources["model"], "rb") as f:
+    model = pickle.load(f)
+encoder = build_feature_encoder(model, sources["feature_names"])
+if encoder is None:
+    sys.exit("❌ Model has no feature names and feature_names.pkl is missing")
+forest = None
+if hasattr(model, "estimators_"):
+    forest = build_flat_forest(model, encoder)
+    print(f"Flattened {forest.n_trees} trees, {forest.n_nodes} nodes")
+
+print("Building catalog...")
+with open(sources["companies"], "r") as f:
+    companies = json.load(f)
+with open(sources["company_models"], "r") as f:
+    company_models = json.load(f)
+if not main.load_dataset():
+    sys.exit("❌ Dataset could not be loaded")
+catalog = {"companies": companies, "company_models": company_models, "dataset": main.dataset_catalog()}
+
+print("Building demand index and cube...")
+store = DemandStore.load(sources["demand_data"])
+cube_arrays = build_cube(store, file_version(sources["demand_data"]))
+
+manifest = save_bundle(bundle_path, sources, encoder.feature_names, catalog, store, cube_arrays, forest)
+print(f"✅ Serving bundle saved to {bundle_path} ({os.path.getsize(bundle_path) / (1024 * 1024):.2f} MB)")
+for name, recorded in manifest["sources"].items():
+    print(f"  {name:<16} {recorded['version']}")
+
+# Reopen it the way the API does and check it against the sources
+start = time.perf_counter()
+bundle = ServingBundle.load(bundle_path)
+stale = bundle.stale_sources(sources)
+state = bundle.model_state()
+bundled_store = bundle.demand_store()
+cube = bundle.demand_cube()
+load_s = time.perf_counter() - start
+
+assert not stale, f"Bundle is stale right after building: {stale}"
+assert state.version == file_version(sources["model"]), "Model version differs"
+assert state.encoder.feature_names == encoder.feature_names, "Encoder columns differ"
+assert bundled_store.size == store.size, "Demand record count differs"
+assert cube is not None and cube.size == len(cube_arrays["count"]), "Demand cube cell count differs"
+assert bundle.catalog == json.loads(json.dumps(catalog)), "Catalog differs"
+print(f"✅ Bundle verified: model {state.version}, {bundled_store.size} demand records, "
+      f"{cube.size} cube cells, opened and loaded in {load_s:.2f}s")
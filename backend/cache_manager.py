@@ -16,13 +16,15 @@ class CacheManager:
         self.companies_cache_file = os.path.join(cache_dir, "companies.json")
         self.models_cache_file = os.path.join(cache_dir, "models.json")
         self.metadata_cache_file = os.path.join(cache_dir, "metadata.json")
-        
-        # Create cache directory if it doesn't exist
-        os.makedirs(cache_dir, exist_ok=True)
+    
+    def _ensure_cache_dir(self) -> None:
+        """Create the cache directory on first save rather than at construction (import) time"""
+        os.makedirs(self.cache_dir, exist_ok=True)
     
     def save_companies(self, companies: List[str]) -> None:
         """Save companies list to cache"""
         try:
+            self._ensure_cache_dir()
             with open(self.companies_cache_file, 'w') as f:
                 json.dump({"companies": sorted(companies)}, f, indent=2)
             logger.info(f"✅ Cached {len(companies)} companies")
@@ -44,6 +46,7 @@ class CacheManager:
     def save_models(self, models_dict: Dict[str, List[str]]) -> None:
         """Save models dictionary to cache"""
         try:
+            self._ensure_cache_dir()
             with open(self.models_cache_file, 'w') as f:
                 json.dump(models_dict, f, indent=2)
             logger.info(f"✅ Cached models for {len(models_dict)} companies")
@@ -65,6 +68,7 @@ class CacheManager:
     def save_metadata(self, metadata: Dict[str, Any]) -> None:
         """Save dataset metadata to cache"""
         try:
+            self._ensure_cache_dir()
             with open(self.metadata_cache_file, 'w') as f:
                 json.dump(metadata, f, indent=2)
             logger.info(f"✅ Cached dataset metadata")
@@ -1,11 +1,17 @@
 import pandas as pd
 import json
 import os
+import sys
+
+from demand_store import DemandStore
 
 # Load the cleaned dataset
 script_dir = os.path.dirname(os.path.abspath(__file__))
 cleaned_data_path = os.path.join(script_dir, "cleaned_training_data.csv")
 
+# Pass --json to also write the old demand_data.json export
+write_json = "--json" in sys.argv[1:]
+
 print("Loading cleaned training data...")
 df = pd.read_csv(cleaned_data_path)
 print(f"Loaded {len(df)} rows")
@@ -18,16 +24,25 @@ demand_df = df[demand_columns].copy()
 # Convert to list of dictionaries
 demand_data = demand_df.to_dict(orient='records')
 
-# Save to JSON
-demand_json_path = os.path.join(script_dir, "demand_data.json")
-with open(demand_json_path, 'w') as f:
-    json.dump(demand_data, f, indent=2)
+# Save the columnar store the API memory-maps
+demand_npz_path = os.path.join(script_dir, "demand_data.npz")
+DemandStore.from_records(demand_data).save(demand_npz_path)
 
-file_size_mb = os.path.getsize(demand_json_path) / (1024 * 1024)
-print(f"✅ Demand data saved to {demand_json_path}")
+file_size_mb = os.path.getsize(demand_npz_path) / (1024 * 1024)
+print(f"✅ Demand data saved to {demand_npz_path}")
 print(f"File size: {file_size_mb:.2f} MB")
 print(f"Total records: {len(demand_data)}")
 
+# Save to JSON
+if write_json:
+    demand_json_path = os.path.join(script_dir, "demand_data.json")
+    with open(demand_json_path, 'w') as f:
+        json.dump(demand_data, f, indent=2)
+
+    file_size_mb = os.path.getsize(demand_json_path) / (1024 * 1024)
+    print(f"✅ Demand data saved to {demand_json_path}")
+    print(f"File size: {file_size_mb:.2f} MB")
+
 # Print sample data
 print(f"\nSample record:")
 print(json.dumps(demand_data[0], indent=2))
@@ -0,0 +1,170 @@
+import logging
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+import numpy as np
+
+from demand_store import OWNERS_MISSING, DemandStore, normalize_string, demand_index_response
+from model_loader import file_version
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Code used for a filter that was not given ("any" roll-up)
+ANY = -1
+# Same tolerance as DemandStore.filter_rows
+YEAR_RANGE = 2
+FILTER_FIELDS = ("transmission", "owners", "fuel_type", "year")
+
+
+def build_cube_cells(store: DemandStore) -> "pd.DataFrame":
+    """Count matches and sum years for every (company, model, transmission, owners, fuel_type, year) key.
+
+    Each filter column is either a value or ANY. For the year column the key
+    is the requested year, so every row is counted under each year within
+    ±YEAR_RANGE of its own plus ANY.
+    """
+    # Only the offline build needs pandas; the API just loads the cube
+    import pandas as pd
+
+    rows = pd.DataFrame({
+        "company": store.codes["company"],
+        "car_model": store.codes["car_model"],
+        "transmission": store.codes["transmission"],
+        "owners": np.where(store.owners == OWNERS_MISSING, ANY, store.owners).astype(np.int32),
+        "fuel_type": store.codes["fuel_type"],
+        "row_year": np.asarray(store.year, dtype=np.float64),
+    })
+    rows["year_sum"] = rows["row_year"]
+    rows["year_count"] = (rows["row_year"] != 0).astype(np.int64)
+
+    # "Any" roll-ups: duplicate every row with the filter column set to ANY
+    for field in ("transmission", "owners", "fuel_type"):
+        rolled = rows.copy()
+        rolled[field] = ANY
+        # Rows with a missing owner count never match an ownership filter
+        keep = rows[rows["owners"] != ANY] if field == "owners" else rows
+        rows = pd.concat([keep, rolled], ignore_index=True)
+
+    windows = [rows.assign(year=ANY)]
+    for offset in range(-YEAR_RANGE, YEAR_RANGE + 1):
+        shifted = rows.assign(year=(rows["row_year"] + offset).astype(np.int32))
+        windows.append(shifted[shifted["year"] > 0])
+    rows = pd.concat(windows, ignore_index=True)
+
+    keys = ["company", "car_model", *FILTER_FIELDS]
+    cells = rows.groupby(keys, sort=True).agg(
+        count=("year_sum", "size"), year_sum=("year_sum", "sum"), year_count=("year_count", "sum")
+    ).reset_index()
+    return cells
+
+
+def build_cube(store: DemandStore, source_version: str) -> Dict[str, np.ndarray]:
+    """Build the arrays written to demand_cube.npz.
+
+    Only counts and average years are stored; demand_index() derives the
+    score, breakdown and analysis from them with the same code as the live scan.
+    """
+    cells = build_cube_cells(store)
+    avg_year = np.full(len(cells), np.nan)
+    has_year = cells["year_count"].to_numpy() > 0
+    avg_year[has_year] = cells["year_sum"].to_numpy()[has_year] / cells["year_count"].to_numpy()[has_year]
+
+    counts = cells["count"].to_numpy()
+    n_companies = len(store.categories["company"])
+    company_stats = np.array([store.company_model_stats(code) for code in range(n_companies)], dtype=np.int64)
+
+    return {
+        "source_version": np.array(source_version),
+        **{f"{field}_values": np.array(store.categories[field], dtype=str) for field in DemandStore.CATEGORICAL_FIELDS},
+        **{field: cells[field].to_numpy(dtype=np.int32) for field in ("company", "car_model", *FILTER_FIELDS)},
+        "count": counts.astype(np.int32),
+        "avg_year": avg_year,
+        "company_stats": company_stats.reshape(-1, 2),
+    }
+
+
+class DemandCube:
+    """Precomputed demand-index cells, looked up by the normalized filter key.
+
+    lookup() returns None for anything the cube does not cover (unknown
+    values, no exact matches), and the caller falls back to DemandStore.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.source_version = str(arrays["source_version"])
+        self.category_codes = {
+            field: {value: code for code, value in enumerate(arrays[f"{field}_values"].tolist())}
+            for field in DemandStore.CATEGORICAL_FIELDS
+        }
+        keys = zip(*(arrays[field].tolist() for field in ("company", "car_model", *FILTER_FIELDS)))
+        self.cells = {key: i for i, key in enumerate(keys)}
+        self.count = arrays["count"]
+        self.avg_year = arrays["avg_year"]
+        self.company_stats = arrays["company_stats"]
+
+    @property
+    def size(self) -> int:
+        return len(self.cells)
+
+    @classmethod
+    def load(cls, path: str, source_path: str) -> Optional["DemandCube"]:
+        """Load the cube, or return None if it was built from a different demand data file.
+
+        demand_cube.npz is compressed, so it is read into memory rather than
+        mapped; the cell dict below holds every key in memory anyway. The
+        serving bundle stores the same arrays uncompressed.
+        """
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in data.files}
+        source_version = file_version(source_path)
+        if str(arrays["source_version"]) != source_version:
+            logger.warning(f"⚠️ Demand cube was built from {arrays['source_version']}, demand data is {source_version}; ignoring it")
+            return None
+        return cls(arrays)
+
+    def _filter_code(self, field: str, value) -> Optional[int]:
+        if not value:
+            return ANY
+        return self.category_codes[field].get(normalize_string(value))
+
+    def lookup(self, company, model, transmission=None, ownership=None, year=None, fuel_type=None) -> Optional[int]:
+        """Return the cell index for a query, or None if it is not in the cube"""
+        company_code = self.category_codes["company"].get(normalize_string(company))
+        model_code = self.category_codes["car_model"].get(normalize_string(model))
+        transmission_code = self._filter_code("transmission", transmission)
+        fuel_code = self._filter_code("fuel_type", fuel_type)
+        if None in (company_code, model_code, transmission_code, fuel_code):
+            return None
+
+        # A given ownership or year of -1 would land on the ANY roll-up, so the live scan answers it
+        owners = ANY
+        if ownership:
+            try:
+                owners = int(ownership)
+            except (ValueError, TypeError):
+                pass
+            else:
+                if owners == ANY:
+                    return None
+
+        year_key = ANY
+        if year:
+            if year != int(year) or int(year) == ANY:
+                return None
+            year_key = int(year)
+
+        return self.cells.get((company_code, model_code, transmission_code, owners, fuel_code, year_key))
+
+    def demand_index(self, company: str, model: str, transmission=None, ownership=None, year=None, fuel_type=None) -> Optional[Dict[str, Any]]:
+        """Build the /demand-index response from the cube, or return None to fall back to the live scan"""
+        cell = self.lookup(company, model, transmission, ownership, year, fuel_type)
+        if cell is None:
+            return None
+        company_code = self.category_codes["company"][normalize_string(company)]
+        max_count_in_company, company_total = (int(v) for v in self.company_stats[company_code])
+        avg_year = None if np.isnan(self.avg_year[cell]) else float(self.avg_year[cell])
+        return demand_index_response(
+            company, model, transmission, ownership, int(self.count[cell]), avg_year, max_count_in_company, company_total
+        )
@@ -316,8 +316,11 @@ class DemandScoreCalculator:
         }
         
         filepath = os.path.join(self.generated_data_dir, "demand_score.json")
-        with open(filepath, 'w') as f:
+        # Write to a temp file and rename it so readers (the API) never see a half-written file
+        tmp_filepath = f"{filepath}.tmp"
+        with open(tmp_filepath, 'w') as f:
             json.dump(demand_score_data, f, indent=2)
+        os.replace(tmp_filepath, filepath)
         
         print(f"Generated {len(demand_scores)} demand scores. Saved to {filepath}")
         return demand_score_data
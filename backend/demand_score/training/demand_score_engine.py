@@ -355,8 +355,11 @@ class DemandScoreEngine:
             "scores": output
         }
         
-        with open(filepath, 'w') as f:
+        # Write to a temp file and rename it so readers (the API) never see a half-written file
+        tmp_filepath = f"{filepath}.tmp"
+        with open(tmp_filepath, 'w') as f:
             json.dump(final_output, f, indent=2)
+        os.replace(tmp_filepath, filepath)
         
         print(f"Saved demand_score.json to {filepath}")
         
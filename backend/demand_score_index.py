@@ -0,0 +1,73 @@
+from typing import Any, Dict, Optional
+
+
+def normalize_key(s) -> str:
+    """Lowercase and collapse whitespace so 'Maruti  Swift ' matches 'maruti swift'"""
+    if s is None:
+        return ""
+    return " ".join(str(s).lower().split())
+
+
+def validate_demand_score_data(data) -> None:
+    """Raise ValueError unless data looks like demand_score.json"""
+    if not isinstance(data, dict):
+        raise ValueError("demand score data must be a JSON object")
+    if not isinstance(data.get("metadata", {}), dict):
+        raise ValueError("'metadata' must be an object")
+    scores = data.get("scores")
+    if not isinstance(scores, dict):
+        raise ValueError("'scores' must be an object keyed by \"Make Model\"")
+    for score_key, score in scores.items():
+        if not isinstance(score, dict):
+            raise ValueError(f"score for {score_key!r} must be an object")
+        if not isinstance(score.get("score"), (int, float)):
+            raise ValueError(f"score for {score_key!r} has no numeric 'score'")
+        if not isinstance(score.get("listingCount", 0), (int, float)):
+            raise ValueError(f"score for {score_key!r} has a non-numeric 'listingCount'")
+        for section in ("components", "analytics"):
+            if not isinstance(score.get(section, {}), dict):
+                raise ValueError(f"score for {score_key!r} has a non-object '{section}'")
+
+
+class DemandScoreIndex:
+    """Lookup tables over demand_score.json's "Make Model" score keys.
+
+    Built once per load: a normalized key -> score dict for exact matches,
+    and for brand-level fallback the best score (highest listingCount, then
+    key name) under every leading-word prefix of the keys, so both lookups
+    are single dict reads.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+        self.metadata: Dict[str, Any] = data.get("metadata", {})
+        scores: Dict[str, Any] = data.get("scores", {})
+
+        self.by_key: Dict[str, Dict[str, Any]] = {}
+        self.best_by_brand: Dict[str, Dict[str, Any]] = {}
+        best_counts: Dict[str, int] = {}
+        # Sorted so ties on listingCount go to the alphabetically first key
+        for score_key in sorted(scores):
+            score = scores[score_key]
+            normalized = normalize_key(score_key)
+            # Keep the first spelling if two keys only differ in case or spacing
+            self.by_key.setdefault(normalized, score)
+
+            words = normalized.split()
+            listing_count = score.get("listingCount", 0) or 0
+            for n in range(1, len(words)):
+                brand = " ".join(words[:n])
+                if brand not in best_counts or listing_count > best_counts[brand]:
+                    best_counts[brand] = listing_count
+                    self.best_by_brand[brand] = score
+
+    def __len__(self) -> int:
+        return len(self.by_key)
+
+    def lookup(self, brand: str, model: str) -> Optional[Dict[str, Any]]:
+        """Exact "brand model" score, else the brand's most-listed model, else None"""
+        brand_norm = normalize_key(brand)
+        score = self.by_key.get(normalize_key(f"{brand_norm} {normalize_key(model)}"))
+        if score is not None:
+            return score
+        return self.best_by_brand.get(brand_norm)
@@ -0,0 +1,496 @@
+import logging
+import sys
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from npz_mmap import load_npz, save_npz
+
+logger = logging.getLogger(__name__)
+
+# Stored in the owners column when the owner count is unknown; never matches an ownership filter
+OWNERS_MISSING = -1
+
+
+def code_dtype(n_values: int):
+    """Smallest unsigned integer type that can hold n_values category codes"""
+    if n_values <= np.iinfo(np.uint8).max + 1:
+        return np.uint8
+    if n_values <= np.iinfo(np.uint16).max + 1:
+        return np.uint16
+    return np.uint32
+
+
+def fit_integer_column(values: np.ndarray, dtype, field: str) -> np.ndarray:
+    """Cast values to the integer `dtype`, or to a wider one of the same kind if some would not fit.
+
+    A plain astype() would wrap out-of-range values (a bad year or owner
+    count in the source data) around silently and corrupt the filters.
+    """
+    dtype = np.dtype(dtype)
+    if values.size == 0:
+        return values.astype(dtype)
+    low, high = values.min(), values.max()
+    for itemsize in (1, 2, 4, 8):
+        candidate = np.dtype(f"{dtype.kind}{itemsize}")
+        if itemsize >= dtype.itemsize and np.iinfo(candidate).min <= low and high <= np.iinfo(candidate).max:
+            if candidate != dtype:
+                logger.warning(f"⚠️ {field} values range from {low} to {high}, storing them as {candidate} instead of {dtype}")
+            return values.astype(candidate)
+    raise ValueError(f"{field} values range from {low} to {high}, which does not fit a 64-bit integer")
+
+
+def is_missing(value) -> bool:
+    return value is None or value != value
+
+
+def normalize_string(s):
+    """Normalize string for comparison"""
+    if s is None:
+        return ""
+    return str(s).lower().strip()
+
+
+def compact(s: str) -> str:
+    """Drop spaces and punctuation so 'wagonr' matches 'wagon r' and 'scorpio n' matches 'scorpio-n'"""
+    return "".join(ch for ch in s if ch.isalnum())
+
+
+def trigrams(s: str) -> set:
+    """Padded character trigrams of a normalized string"""
+    padded = f"  {s} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ModelNameIndex:
+    """Trigram index over the distinct car_model values of one company.
+
+    search() ranks candidates by trigram similarity to the query, boosted
+    when the names only differ in spacing/punctuation, when one is a prefix
+    of the other or when they share the first word, and breaks ties by how
+    many cars the model has.
+    """
+
+    MIN_SIMILARITY = 0.3
+
+    def __init__(self, names: Dict[int, str], counts: Dict[int, int]):
+        # Blank or missing names have no words to compare and could never be a useful match
+        self.names = {code: name for code, name in names.items() if isinstance(name, str) and name.split()}
+        self.counts = counts
+        self.grams: Dict[int, set] = {code: trigrams(name) for code, name in self.names.items()}
+        self.postings: Dict[str, List[int]] = {}
+        for code, grams in self.grams.items():
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(code)
+
+    def score(self, query: str, query_grams: set, code: int, shared: int) -> float:
+        name = self.names[code]
+        similarity = shared / (len(query_grams) + len(self.grams[code]) - shared)
+        if compact(query) == compact(name):
+            return similarity + 2.0
+        if query.startswith(name + " ") or name.startswith(query + " ") or name.startswith(query):
+            return similarity + 1.0
+        if query.split()[0] == name.split()[0]:
+            return similarity + 0.5
+        return similarity if similarity >= self.MIN_SIMILARITY else 0.0
+
+    def search(self, query: str, limit: int = 5) -> List[tuple]:
+        """Return up to `limit` (score, model_code) candidates, best first"""
+        if not query or not query.split():
+            return []
+        query_grams = trigrams(query)
+        shared: Dict[int, int] = {}
+        for gram in query_grams:
+            for code in self.postings.get(gram, ()):
+                shared[code] = shared.get(code, 0) + 1
+
+        ranked = []
+        for code, count in shared.items():
+            score = self.score(query, query_grams, code, count)
+            if score > 0:
+                ranked.append((score, self.counts.get(code, 0), -len(self.names[code]), code))
+        ranked.sort(reverse=True)
+        return [(round(score, 3), code) for score, _, _, code in ranked[:limit]]
+
+
+class DemandStore:
+    """Columnar, dictionary-encoded copy of the demand data.
+
+    Categorical fields are stored as integer codes into per-field category
+    tables and numeric fields as NumPy arrays. Rows are kept sorted by
+    (company, car_model, year), so every (company, car_model) group and
+    every company is one contiguous run of rows and a demand-index request
+    only touches the rows it needs.
+
+    Columns use the narrowest types that hold them (uint8 codes for small
+    category tables, int16 years, int8 owners, float32 kms and prices; wider
+    integer types only if the data does not fit) and
+    category strings are interned once, so a row costs about 16 bytes. The
+    columns can also be memory-mapped from demand_data.npz (see save/load),
+    so loading costs little beyond the small per-group tables.
+    """
+
+    CATEGORICAL_FIELDS = ("company", "car_model", "fuel_type", "transmission")
+    NUMERIC_FIELDS = ("year", "kms_driven", "owners", "price")
+
+    def __init__(self, categories: Dict[str, List[Any]], columns: Dict[str, np.ndarray], group_starts: Optional[np.ndarray] = None):
+        """Build the store from rows already sorted by (company, car_model, year)"""
+        self.size = len(columns['year'])
+        self.categories = {
+            field: [sys.intern(value) if isinstance(value, str) else value for value in values]
+            for field, values in categories.items()
+        }
+        self.category_codes: Dict[str, Dict[Any, int]] = {
+            field: {value: code for code, value in enumerate(values)} for field, values in self.categories.items()
+        }
+        self.codes: Dict[str, np.ndarray] = {field: columns[field] for field in self.CATEGORICAL_FIELDS}
+        self.year = columns['year']
+        self.owners = columns['owners']
+        self.kms_driven = columns['kms_driven']
+        self.price = columns['price']
+
+        self._build_indexes(group_starts)
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> "DemandStore":
+        """Encode a list of demand_data.json records and sort them into group order"""
+        size = len(records)
+
+        # Dictionary-encode categoricals: value -> code, code -> value
+        categories: Dict[str, List[Any]] = {}
+        columns: Dict[str, np.ndarray] = {}
+        for field in cls.CATEGORICAL_FIELDS:
+            table: Dict[Any, int] = {}
+            codes = np.fromiter(
+                (table.setdefault(record.get(field), len(table)) for record in records),
+                dtype=np.int64, count=size
+            )
+            columns[field] = fit_integer_column(codes, code_dtype(len(table)), field)
+            categories[field] = list(table)
+
+        # Model years fit in int16 and owner counts in int8; 0 marks a missing year as before
+        columns['year'] = fit_integer_column(np.fromiter(
+            (0 if is_missing(record.get('year')) else record['year'] for record in records),
+            dtype=np.float64, count=size
+        ), np.int16, 'year')
+        columns['owners'] = fit_integer_column(np.fromiter(
+            (OWNERS_MISSING if is_missing(record.get('owners')) else record['owners'] for record in records),
+            dtype=np.float64, count=size
+        ), np.int8, 'owners')
+        for field in ('kms_driven', 'price'):
+            columns[field] = np.fromiter(
+                (np.nan if record.get(field) is None else record[field] for record in records),
+                dtype=np.float32, count=size
+            )
+
+        order = np.lexsort((columns['year'], columns['car_model'], columns['company']))
+        return cls(categories, {field: column[order] for field, column in columns.items()})
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """The columns, category tables and group offsets written by save()"""
+        arrays = {f"{field}_values": np.array(values, dtype=str) for field, values in self.categories.items()}
+        arrays.update({field: np.asarray(codes) for field, codes in self.codes.items()})
+        arrays.update({field: np.asarray(getattr(self, field)) for field in self.NUMERIC_FIELDS})
+        arrays['group_starts'] = self.group_starts
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "DemandStore":
+        """Rebuild a store from to_arrays() output (memory-mapped or not)"""
+        categories = {field: arrays[f"{field}_values"].tolist() for field in cls.CATEGORICAL_FIELDS}
+        return cls(categories, arrays, np.asarray(arrays['group_starts']))
+
+    def save(self, path: str) -> None:
+        """Write the store as an uncompressed, mappable .npz"""
+        save_npz(path, self.to_arrays())
+
+    @classmethod
+    def load(cls, path: str) -> "DemandStore":
+        """Memory-map a store written by save()"""
+        return cls.from_arrays(load_npz(path))
+
+    def _build_indexes(self, group_starts: Optional[np.ndarray] = None) -> None:
+        company_codes = self.codes['company']
+        model_codes = self.codes['car_model']
+
+        # Each group starts where (company, model) changes
+        if group_starts is None:
+            changed = (company_codes[1:] != company_codes[:-1]) | (model_codes[1:] != model_codes[:-1])
+            group_starts = np.flatnonzero(np.r_[True, changed]) if self.size else np.array([], dtype=np.int64)
+        self.group_starts = group_starts.astype(np.int64)
+        group_ends = np.r_[self.group_starts[1:], self.size].astype(np.int64)
+
+        # [start, end) row bounds of every group and company; row positions are built per request
+        # from these, so nothing proportional to the row count is held besides the (mappable) columns
+        self.group_bounds: Dict[tuple, tuple] = {}
+        self.company_models: Dict[int, List[int]] = {}
+        self.company_bounds: Dict[int, tuple] = {}
+        for start, end in zip(self.group_starts.tolist(), group_ends.tolist()):
+            company_code, model_code = int(company_codes[start]), int(model_codes[start])
+            self.group_bounds[(company_code, model_code)] = (start, end)
+            self.company_models.setdefault(company_code, []).append(model_code)
+            self.company_bounds[company_code] = (self.company_bounds.get(company_code, (start, end))[0], end)
+
+        # Per-company model frequency tables for base popularity; they only change with the data
+        self.model_counts: Dict[int, Dict[int, int]] = {}
+        self.company_stats: Dict[int, tuple] = {}
+        for (company_code, model_code), (start, end) in self.group_bounds.items():
+            self.model_counts.setdefault(company_code, {})[model_code] = end - start
+        for company_code, counts in self.model_counts.items():
+            self.company_stats[company_code] = (max(counts.values()), sum(counts.values()))
+
+        # Fuzzy lookup of model names that have no exact match
+        self.model_name_indexes: Dict[int, ModelNameIndex] = {
+            company_code: ModelNameIndex({code: self.model_name(code) or '' for code in counts}, counts)
+            for company_code, counts in self.model_counts.items()
+        }
+
+    def memory_usage(self) -> Dict[str, Any]:
+        """Approximate bytes held by the columns, category tables and indexes"""
+        column_bytes = {field: int(codes.nbytes) for field, codes in self.codes.items()}
+        column_bytes.update({field: int(getattr(self, field).nbytes) for field in self.NUMERIC_FIELDS})
+
+        category_bytes = sum(
+            sys.getsizeof(values) + sum(sys.getsizeof(value) for value in values)
+            for values in self.categories.values()
+        ) + sum(sys.getsizeof(table) for table in self.category_codes.values())
+
+        index_bytes = int(self.group_starts.nbytes)
+        for table in (self.group_bounds, self.company_bounds):
+            index_bytes += sys.getsizeof(table) + sum(sys.getsizeof(key) + sys.getsizeof(bounds) for key, bounds in table.items())
+
+        total = sum(column_bytes.values()) + category_bytes + index_bytes
+        return {
+            "records": self.size,
+            "memory_mapped": isinstance(self.year, np.memmap),
+            "column_bytes": column_bytes,
+            "category_table_bytes": category_bytes,
+            "index_bytes": index_bytes,
+            "total_bytes": total,
+            "bytes_per_record": round(total / self.size, 1) if self.size else 0.0
+        }
+
+    def code(self, field: str, value) -> Optional[int]:
+        """Return the code of a categorical value, or None if it never occurs"""
+        return self.category_codes[field].get(value)
+
+    def group_rows_in_years(self, company_code, model_code, year=None, year_min=None, year_max=None) -> np.ndarray:
+        """Rows of a (company, model) group within the year window, found by binary search on the sorted years"""
+        bounds = self.group_bounds.get((company_code, model_code))
+        if bounds is None:
+            return np.array([], dtype=np.int64)
+        group_start, group_end = bounds
+        years = self.year[group_start:group_end]
+
+        low, high = year_min, year_max
+        if year:
+            year_range = 2  # Allow ±2 years
+            low = year - year_range if low is None else max(low, year - year_range)
+            high = year + year_range if high is None else min(high, year + year_range)
+
+        start = np.searchsorted(years, low, side='left') if low is not None else 0
+        end = np.searchsorted(years, high, side='right') if high is not None else len(years)
+        return np.arange(group_start + start, group_start + max(start, end))
+
+    def filter_rows(self, rows: np.ndarray, transmission=None, ownership=None, fuel_type=None) -> np.ndarray:
+        """Apply the transmission, ownership and fuel type filters to a set of row positions"""
+        # Apply transmission filter if provided
+        if transmission:
+            code = self.code('transmission', normalize_string(transmission))
+            rows = rows[self.codes['transmission'][rows] == code] if code is not None else rows[:0]
+
+        # Apply ownership filter if provided
+        if ownership:
+            try:
+                ownership_num = int(ownership)
+                if ownership_num == OWNERS_MISSING:
+                    rows = rows[:0]
+                else:
+                    rows = rows[self.owners[rows] == ownership_num]
+            except (ValueError, TypeError):
+                pass
+
+        # Apply fuel type filter if provided
+        if fuel_type:
+            code = self.code('fuel_type', normalize_string(fuel_type))
+            rows = rows[self.codes['fuel_type'][rows] == code] if code is not None else rows[:0]
+
+        return rows
+
+    def model_name(self, model_code: int) -> str:
+        return self.categories['car_model'][model_code]
+
+    def company_model_stats(self, company_code: Optional[int]):
+        """Return (max rows of any one model, total rows) for a company"""
+        return self.company_stats.get(company_code, (1, 0))
+
+    def demand_index(self, company: str, model: str, transmission=None, ownership=None, year=None, fuel_type=None,
+                     year_min=None, year_max=None) -> Dict[str, Any]:
+        """Compute the /demand-index response for one car"""
+        company_norm = normalize_string(company)
+        model_norm = normalize_string(model)
+        return self._demand_index(
+            self.code('company', company_norm), self.code('car_model', model_norm), company_norm, model_norm,
+            company, model, transmission, ownership, year, fuel_type, year_min, year_max
+        )
+
+    def demand_index_many(self, queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Compute /demand-index responses for many cars, in input order.
+
+        Queries are grouped by (company, model) so codes are resolved once per
+        group, and repeated queries within a group are computed once.
+        """
+        groups: Dict[tuple, List[int]] = {}
+        for i, query in enumerate(queries):
+            key = (normalize_string(query.get('company')), normalize_string(query.get('model')))
+            groups.setdefault(key, []).append(i)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(queries)
+        for (company_norm, model_norm), positions in groups.items():
+            company_code = self.code('company', company_norm)
+            model_code = self.code('car_model', model_norm)
+            computed: Dict[tuple, Dict[str, Any]] = {}
+            for i in positions:
+                query = queries[i]
+                args = tuple(query.get(field) for field in (
+                    'company', 'model', 'transmission', 'ownership', 'year', 'fuel_type', 'year_min', 'year_max'
+                ))
+                if args not in computed:
+                    computed[args] = self._demand_index(company_code, model_code, company_norm, model_norm, *args)
+                results[i] = computed[args]
+        return results
+
+    def _demand_index(self, company_code, model_code, company_norm, model_norm, company, model,
+                      transmission=None, ownership=None, year=None, fuel_type=None,
+                      year_min=None, year_max=None) -> Dict[str, Any]:
+        # Start with company and model filter, narrowed to the year window
+        rows = self.group_rows_in_years(company_code, model_code, year, year_min, year_max)
+        matches = self.filter_rows(rows, transmission, ownership, fuel_type)
+
+        company_start, company_end = self.company_bounds.get(company_code, (0, 0))
+        company_size = company_end - company_start
+
+        # A model name the company doesn't have is answered from its best-ranked similar model,
+        # with the same filters; a known model with no matching cars never borrows another's figures
+        matched_model = None
+        if (company_code, model_code) not in self.group_bounds and company_size > 0:
+            candidates = self.model_name_indexes[company_code].search(model_norm, limit=1)
+            if candidates:
+                candidate_code = candidates[0][1]
+                matched_model = self.model_name(candidate_code)
+                rows = self.group_rows_in_years(company_code, candidate_code, year, year_min, year_max)
+                matches = self.filter_rows(rows, transmission, ownership, fuel_type)
+                logger.info(f"Using fuzzy match for model: {model_norm} -> {matched_model}")
+
+        # If still no matches, use company-level data as fallback
+        if len(matches) == 0 and company_size > 0:
+            logger.info(f"Using company-level data for: {company_norm}")
+            return company_level_response(company, model, transmission, ownership, company_size)
+
+        max_count_in_company, company_total = self.company_model_stats(company_code)
+        years = self.year[matches]
+        years = years[years != 0]
+        avg_year = float(years.sum() / len(years)) if len(years) else None
+        response = demand_index_response(
+            company, model, transmission, ownership, len(matches), avg_year, max_count_in_company, company_total
+        )
+        if matched_model is not None:
+            response["matched_model"] = matched_model
+        return response
+
+
+def company_level_response(company, model, transmission, ownership, company_total) -> Dict[str, Any]:
+    """Response used when only company-level data is available"""
+    return {
+        "company": company,
+        "model": model,
+        "transmission": transmission if transmission else "any",
+        "ownership": ownership if ownership else "any",
+        "demand_index": 50.0,  # Neutral score for company-level estimate
+        "confidence_score": 30.0,  # Low confidence due to lack of specific data
+        "message": f"No specific data for {model}. Using company-level demand estimate for {company}.",
+        "metrics": {
+            "matches_count": company_total,
+            "company_total": company_total,
+            "sample_size": company_total,
+            "data_freshness": "company_level"
+        },
+        "breakdown": {
+            "base_popularity": 50.0,
+            "transmission_adjustment": 0.0,
+            "ownership_adjustment": 0.0,
+            "year_adjustment": 0.0
+        },
+        "analysis": {
+            "insight": f"Based on overall demand for {company} vehicles",
+            "recommendation": "Consider adding more specific car data for accurate predictions"
+        }
+    }
+
+
+def demand_index_response(company, model, transmission, ownership, sample_size, avg_year,
+                          max_count_in_company, company_total) -> Dict[str, Any]:
+    """Build the demand-index response from the match count and average year of the matches"""
+    # Base popularity score
+    base_popularity = (sample_size / max_count_in_company) * 100
+
+    # Higher confidence with larger sample sizes
+    if sample_size >= 100:
+        confidence = 0.95
+    elif sample_size >= 50:
+        confidence = 0.85
+    elif sample_size >= 20:
+        confidence = 0.70
+    elif sample_size >= 10:
+        confidence = 0.50
+    else:
+        confidence = 0.30
+
+    # Adjust demand index based on year (newer cars might have different demand patterns)
+    if avg_year is not None:
+        current_year = 2025  # Update this dynamically
+        year_factor = 1.0
+
+        # Slight boost for cars 3-7 years old (sweet spot for used cars)
+        if 3 <= (current_year - avg_year) <= 7:
+            year_factor = 1.1
+        # Penalty for very old cars (>10 years)
+        elif (current_year - avg_year) > 10:
+            year_factor = 0.9
+
+        base_popularity *= year_factor
+
+    # Normalize to 0-100 range
+    demand_index = max(1, min(100, round(base_popularity, 1)))
+
+    # Build breakdown
+    breakdown = {
+        "sample_size": sample_size,
+        "company_market_share": round((sample_size / company_total) * 100, 2) if company_total > 0 else 0,
+        "base_popularity_score": round(base_popularity, 2)
+    }
+
+    # Build analysis
+    analysis = {
+        "demand_level": "High" if demand_index >= 70 else "Medium" if demand_index >= 40 else "Low",
+        "data_reliability": "High" if confidence >= 0.85 else "Medium" if confidence >= 0.50 else "Low",
+        "market_position": f"Top {min(10, round((sample_size / max_count_in_company) * 100))}%" if max_count_in_company > 0 else "Unknown"
+    }
+
+    return {
+        "company": company,
+        "model": model,
+        "transmission": transmission if transmission else "any",
+        "ownership": ownership if ownership else "any",
+        "demand_index": float(demand_index),
+        "confidence_score": round(confidence, 2),
+        "message": f"Demand index calculated with {round(confidence * 100)}% confidence based on {sample_size} data points",
+        "metrics": {
+            "matches_count": sample_size,
+            "company_total": company_total,
+            "sample_size": sample_size,
+            "data_freshness": "static_dataset"
+        },
+        "breakdown": breakdown,
+        "analysis": analysis
+    }
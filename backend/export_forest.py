@@ -0,0 +1,64 @@
+import os
+import pickle
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from feature_encoder import FeatureEncoder
+from forest_engine import FlatForest
+
+warnings.filterwarnings("ignore", message="X does not have valid feature names")
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.path.join(script_dir, "CarPriceModel.pkl")
+FOREST_PATH = os.path.join(script_dir, "CarPriceModel.forest.npz")
+CLEANED_DATA_PATH = os.path.join(script_dir, "cleaned_training_data.csv")
+
+
+def verify_forest(model, forest, n_rows=1000):
+    """Check the flattened forest against model.predict on training rows"""
+    encoder = FeatureEncoder.from_model(model)
+    sample = pd.read_csv(CLEANED_DATA_PATH).dropna(subset=['year', 'kms_driven', 'owners'])
+    sample = sample.sample(min(n_rows, len(sample)), random_state=42)
+    for col in ['service_history', 'previous_accidents']:
+        if col in sample.columns:
+            sample[col] = sample[col].astype(bool)
+        else:
+            sample[col] = False
+    X = encoder.encode_many(sample.to_dict(orient='records'))
+
+    expected = model.predict(X)
+    actual = forest.predict(X)
+    max_error = float(np.max(np.abs(expected - actual)))
+    if not np.allclose(expected, actual, rtol=1e-9, atol=1e-6):
+        raise ValueError(f"Flattened forest differs from model.predict (max abs error {max_error})")
+    return len(X), max_error
+
+
+def export_forest(model_path=MODEL_PATH, forest_path=FOREST_PATH):
+    """Flatten CarPriceModel.pkl into contiguous arrays for the API's flat engine"""
+    print(f"Loading model from {model_path}...")
+    with open(model_path, "rb") as f:
+        model = pickle.load(f)
+
+    start = time.perf_counter()
+    forest = FlatForest.from_model(model)
+    print(f"Flattened {forest.n_trees} trees, {forest.n_nodes} nodes, depth {forest.max_depth} "
+          f"in {time.perf_counter() - start:.2f}s")
+
+    rows, max_error = verify_forest(model, forest)
+    print(f"✅ Verified against model.predict on {rows} rows (max abs error {max_error:.2e})")
+
+    forest.save(forest_path)
+    print(f"✅ Flattened forest saved to {forest_path}")
+    print(f"File size: {os.path.getsize(forest_path) / (1024 * 1024):.2f} MB")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        export_forest(*sys.argv[1:3])
+    else:
+        export_forest()
@@ -0,0 +1,62 @@
+import pickle
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+
+class FeatureEncoder:
+    """Maps car request fields straight to the model's one-hot feature columns.
+
+    Produces the same matrix as ``pd.get_dummies(df).reindex(columns=feature_names, fill_value=0)``
+    without building any DataFrames per request.
+    """
+
+    CATEGORICAL_FIELDS = ("company", "car_model", "fuel_type", "transmission", "insurance")
+    NUMERIC_FIELDS = ("year", "kms_driven", "owners", "service_history", "previous_accidents")
+
+    def __init__(self, feature_names: Sequence[str]):
+        self.feature_names = [str(name) for name in feature_names]
+        self.n_features = len(self.feature_names)
+        column_index = {name: i for i, name in enumerate(self.feature_names)}
+
+        # Numeric fields are copied as-is into their column (if the model uses them)
+        self.numeric_offsets = [
+            (field, column_index[field]) for field in self.NUMERIC_FIELDS if field in column_index
+        ]
+
+        # Categorical fields map "<field>_<value>" dummy columns to offsets
+        self.category_offsets: Dict[str, Dict[str, int]] = {field: {} for field in self.CATEGORICAL_FIELDS}
+        for name, i in column_index.items():
+            for field in self.CATEGORICAL_FIELDS:
+                prefix = f"{field}_"
+                if name.startswith(prefix):
+                    self.category_offsets[field][name[len(prefix):]] = i
+
+    @classmethod
+    def from_model(cls, model) -> "FeatureEncoder":
+        """Build the encoder from a fitted model's feature_names_in_"""
+        return cls(model.feature_names_in_)
+
+    @classmethod
+    def from_pickle(cls, path: str) -> "FeatureEncoder":
+        """Build the encoder from feature_names.pkl written by train_combined_model.py"""
+        with open(path, "rb") as f:
+            return cls(pickle.load(f))
+
+    def _fill_row(self, row: np.ndarray, input_data: Dict[str, Any]) -> None:
+        for field, i in self.numeric_offsets:
+            # A missing field leaves its column at 0, like reindex(fill_value=0) did
+            value = input_data.get(field)
+            if value is not None:
+                row[i] = float(value)
+        for field, offsets in self.category_offsets.items():
+            i = offsets.get(input_data.get(field))
+            if i is not None:
+                row[i] = 1.0
+
+    def encode_many(self, rows: List[Dict[str, Any]]) -> np.ndarray:
+        """Encode many input rows into a (len(rows), n_features) matrix"""
+        X = np.zeros((len(rows), self.n_features), dtype=np.float64)
+        for row, input_data in zip(X, rows):
+            self._fill_row(row, input_data)
+        return X
@@ -0,0 +1,59 @@
+import logging
+import os
+import threading
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class FileWatcher:
+    """Polls a file's mtime and size and calls back when they change"""
+
+    def __init__(self, path: str, callback: Callable[[], None], interval_seconds: float = 30.0):
+        self.path = path
+        self.callback = callback
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Taken in start() so constructing a watcher (at import time) does no I/O
+        self._signature = None
+
+    def _current_signature(self):
+        try:
+            stat = os.stat(self.path)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._signature = self._current_signature()
+        self._thread = threading.Thread(
+            target=self._run, name=f"watch-{os.path.basename(self.path)}", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Watching {self.path} every {self.interval_seconds}s")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(self.interval_seconds + 1)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            signature = self._current_signature()
+            if signature is None or signature == self._signature:
+                continue
+            self._signature = signature
+            logger.info(f"Detected change in {self.path}")
+            try:
+                self.callback()
+            except Exception as e:
+                logger.error(f"Reload after change in {self.path} failed: {e}")
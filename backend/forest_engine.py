@@ -0,0 +1,153 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+class FlatForest:
+    """A RandomForestRegressor flattened into contiguous NumPy arrays.
+
+    All trees share one node table. Leaves point back to themselves, so every
+    tree can be walked in lockstep until all walks have reached a leaf, without
+    sklearn's validation and thread dispatch in the hot path.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, max_depth, n_features,
+                 feature_names: Optional[List[str]] = None):
+        self.feature = np.ascontiguousarray(feature, dtype=np.int32)
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float64)
+        self.left = np.ascontiguousarray(left, dtype=np.int32)
+        self.right = np.ascontiguousarray(right, dtype=np.int32)
+        self.value = np.ascontiguousarray(value, dtype=np.float64)
+        self.roots = np.ascontiguousarray(roots, dtype=np.int32)
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+        self.feature_names = list(feature_names) if feature_names is not None else None
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.feature)
+
+    @classmethod
+    def from_model(cls, model) -> "FlatForest":
+        """Flatten a fitted sklearn forest regressor"""
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            n = tree.node_count
+            node_ids = np.arange(n, dtype=np.int64) + offset
+            is_leaf = tree.children_left == -1
+
+            # Leaves loop back to themselves; their feature is never a real split
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left + offset))
+            rights.append(np.where(is_leaf, node_ids, tree.children_right + offset))
+            values.append(tree.value[:, 0, 0])
+            roots.append(offset)
+
+            offset += n
+            max_depth = max(max_depth, tree.max_depth)
+
+        feature_names = list(model.feature_names_in_) if hasattr(model, "feature_names_in_") else None
+        return cls(
+            np.concatenate(features), np.concatenate(thresholds),
+            np.concatenate(lefts), np.concatenate(rights), np.concatenate(values),
+            roots, max_depth, model.n_features_in_, feature_names
+        )
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """The arrays written by save()"""
+        arrays = {
+            "feature": self.feature,
+            "threshold": self.threshold,
+            "left": self.left,
+            "right": self.right,
+            "value": self.value,
+            "roots": self.roots,
+            "max_depth": np.array(self.max_depth),
+            "n_features": np.array(self.n_features),
+        }
+        if self.feature_names is not None:
+            arrays["feature_names"] = np.array(self.feature_names, dtype=str)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "FlatForest":
+        """Rebuild a flattened forest from to_arrays() output"""
+        feature_names = arrays["feature_names"].tolist() if "feature_names" in arrays else None
+        return cls(
+            arrays["feature"], arrays["threshold"], arrays["left"], arrays["right"], arrays["value"],
+            arrays["roots"], arrays["max_depth"], arrays["n_features"], feature_names
+        )
+
+    def save(self, path: str) -> None:
+        """Write the flattened forest to an .npz file"""
+        np.savez(path, **self.to_arrays())
+
+    @classmethod
+    def load(cls, path: str) -> "FlatForest":
+        """Load a flattened forest written by save()"""
+        with np.load(path, allow_pickle=False) as data:
+            return cls.from_arrays({name: data[name] for name in data.files})
+
+    def predict_trees(self, X) -> np.ndarray:
+        """Return every tree's leaf value as a (n_rows, n_trees) matrix"""
+        # sklearn compares float32 features against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        rows = np.arange(X.shape[0])[:, None]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], self.n_trees))
+
+        # Most paths are far shorter than the deepest tree, so stop once every walk has settled on a leaf
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            next_nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+            if np.array_equal(next_nodes, nodes):
+                break
+            nodes = next_nodes
+
+        return self.value[nodes]
+
+    def predict(self, X) -> np.ndarray:
+        """Average the tree outputs like RandomForestRegressor.predict"""
+        return self.predict_trees(X).mean(axis=1)
+
+
+class LeafValueTable:
+    """Leaf values of every tree in a sklearn forest, stacked into one array.
+
+    Combined with ``model.apply`` (one call for all trees) this gives the full
+    per-tree output matrix without calling ``estimator.predict`` per tree.
+    """
+
+    def __init__(self, model):
+        values, offsets = [], []
+        offset = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            values.append(tree.value[:, 0, 0])
+            offsets.append(offset)
+            offset += tree.node_count
+        self.values = np.concatenate(values)
+        self.offsets = np.array(offsets, dtype=np.int64)
+
+    def predict_trees(self, model, X) -> np.ndarray:
+        """Return every tree's leaf value as a (n_rows, n_trees) matrix"""
+        return self.values[model.apply(X) + self.offsets]
+
+
+# Percentiles reported by interval mode
+INTERVAL_PERCENTILES = (10, 50, 90)
+
+
+def summarize_tree_outputs(tree_outputs: np.ndarray) -> np.ndarray:
+    """Reduce a (n_rows, n_trees) matrix to columns [mean, p10, p50, p90]"""
+    percentiles = np.percentile(tree_outputs, INTERVAL_PERCENTILES, axis=1).T
+    return np.column_stack([tree_outputs.mean(axis=1), percentiles])
@@ -0,0 +1,185 @@
+import logging
+import multiprocessing
+import threading
+import warnings
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Per-process state, set up once by _init_worker
+_worker_state = None
+
+
+class InferencePoolFull(Exception):
+    """Raised when the pool already has its maximum number of queued requests"""
+
+
+class InferencePoolStopped(Exception):
+    """Raised when the pool was shut down before a request could be submitted"""
+
+
+def load_worker_state(model_path: str, feature_names_path: Optional[str], forest_path: Optional[str],
+                      engine: str, bundle_path: Optional[str] = None):
+    """Load the model the way the API process does: from the serving bundle or through load_model_state"""
+    if bundle_path:
+        from serving_bundle import ServingBundle
+        return ServingBundle.load(bundle_path).model_state(engine)
+    from model_loader import load_model_state
+    return load_model_state(model_path, feature_names_path, forest_path, engine)
+
+
+def _init_worker(load_args: tuple) -> None:
+    """Load and smoke-test the model once per worker process"""
+    global _worker_state
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+    _worker_state = load_worker_state(*load_args)
+
+
+def _predict_rows(rows: List[Dict[str, Any]]) -> List[float]:
+    state = _worker_state
+    return state.predict_matrix(state.encoder.encode_many(rows)).tolist()
+
+
+def _predict_rows_with_intervals(rows: List[Dict[str, Any]]) -> List[List[float]]:
+    from forest_engine import summarize_tree_outputs
+
+    state = _worker_state
+    return summarize_tree_outputs(state.predict_trees(state.encoder.encode_many(rows))).tolist()
+
+
+def _worker_version() -> str:
+    return _worker_state.version
+
+
+class InferencePool:
+    """Runs encoding and prediction in worker processes to use more than one core.
+
+    Workers load the model through the same loaders as the API process and
+    must report the model version the caller expects, so they never serve
+    a different or unvalidated artifact.
+    """
+
+    def __init__(self, model_path: str, workers: int = 4, max_queue_depth: int = 64, engine: str = "sklearn",
+                 feature_names_path: Optional[str] = None, forest_path: Optional[str] = None):
+        self.model_path = model_path
+        self.feature_names_path = feature_names_path
+        self.forest_path = forest_path
+        self.model_version: Optional[str] = None
+        self.workers = workers
+        self.max_queue_depth = max_queue_depth
+        self.engine = engine
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots = threading.BoundedSemaphore(max_queue_depth)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @property
+    def running(self) -> bool:
+        return self._executor is not None
+
+    def _create_executor(self, version: str, bundle_path: Optional[str]) -> ProcessPoolExecutor:
+        # spawn avoids forking a process that already runs server threads
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=((self.model_path, self.feature_names_path, self.forest_path, self.engine, bundle_path),)
+        )
+        try:
+            # Wait until the workers have loaded the model; a failed load or smoke test breaks the pool
+            try:
+                versions = {future.result() for future in [executor.submit(_worker_version) for _ in range(self.workers)]}
+            except BrokenProcessPool as e:
+                raise RuntimeError("Inference workers failed to load the model") from e
+            if versions != {version}:
+                raise RuntimeError(f"Inference workers loaded model {', '.join(sorted(versions))}, expected {version}")
+        except Exception:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        return executor
+
+    def start(self, version: str, bundle_path: Optional[str] = None) -> None:
+        """Spawn the worker processes; they must load model `version` (from the serving bundle if given)"""
+        if self.running:
+            return
+        self._executor = self._create_executor(version, bundle_path)
+        self.model_version = version
+        logger.info(f"✅ Inference pool started with {self.workers} worker processes (model {version})")
+
+    def shutdown(self) -> None:
+        """Let queued requests finish, then stop the workers"""
+        if not self.running:
+            return
+        with self._lock:
+            executor, self._executor = self._executor, None
+        executor.shutdown(wait=True)
+        logger.info("Inference pool stopped")
+
+    def restart(self, version: str, bundle_path: Optional[str] = None) -> None:
+        """Swap in fresh workers that load model `version`; old workers finish their queue.
+
+        Raises (and keeps the current workers) if the new ones fail to load, smoke-test or
+        match that version.
+        """
+        new_executor = self._create_executor(version, bundle_path)
+        with self._lock:
+            old_executor, self._executor = self._executor, new_executor
+        self.model_version = version
+        if old_executor is not None:
+            old_executor.shutdown(wait=True)
+        logger.info(f"✅ Inference pool restarted with {self.workers} worker processes (model {version})")
+
+    def predict(self, rows: List[Dict[str, Any]], timeout: Optional[float] = 30.0) -> List[float]:
+        """Encode and predict rows in a worker process"""
+        return self._run(_predict_rows, rows, timeout)
+
+    def predict_with_intervals(self, rows: List[Dict[str, Any]], timeout: Optional[float] = 30.0) -> List[List[float]]:
+        """Encode rows and return [mean, p10, p50, p90] for each, computed in a worker process"""
+        return self._run(_predict_rows_with_intervals, rows, timeout)
+
+    def _run(self, fn, rows: List[Dict[str, Any]], timeout: Optional[float]):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise InferencePoolFull(f"Inference queue is full ({self.max_queue_depth} requests)")
+        # Submit under the lock so shutdown()/restart() can't stop the executor in between
+        with self._lock:
+            try:
+                if self._executor is None:
+                    raise InferencePoolStopped("Inference pool is not running")
+                future = self._executor.submit(fn, rows)
+            except BaseException:
+                self._slots.release()
+                raise
+            self.in_flight += 1
+        # The slot stays taken until the worker is done, even if the caller stops waiting
+        future.add_done_callback(self._finished)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            # Drop it if no worker has picked it up yet
+            future.cancel()
+            raise
+
+    def _finished(self, future: Future) -> None:
+        self._slots.release()
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self.running,
+                "workers": self.workers,
+                "engine": self.engine,
+                "model_version": self.model_version,
+                "max_queue_depth": self.max_queue_depth,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected
+            }
@@ -0,0 +1,33 @@
+import importlib
+from types import ModuleType
+from typing import Optional
+
+
+class LazyModule:
+    """Stands in for a module and imports it on first attribute access.
+
+    ``pd = LazyModule("pandas")`` keeps ``pd.read_csv(...)`` call sites as
+    they are while moving the import cost from process start to the first
+    code path that needs it. importlib's module locks make the first access
+    safe from several threads.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module: Optional[ModuleType] = None
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
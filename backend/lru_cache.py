@@ -0,0 +1,72 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class LRUCache:
+    """Thread-safe bounded LRU cache with a per-entry TTL and hit/miss/eviction counters"""
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 3600.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss/eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+            }
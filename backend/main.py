@@ -369,20 +369,45 @@
 #     uvicorn.run(app, host="0.0.0.0", port=8000)
 
 
-from fastapi import FastAPI, HTTPException, Query
-from pydantic import BaseModel, Field
-import pandas as pd
-import pickle
+from fastapi import FastAPI, HTTPException, Query, Header, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+import numpy as np
 import os
 import json
+import hmac
+import math
 from fastapi.middleware.cors import CORSMiddleware
-import requests
 import logging
-from typing import Optional
+from typing import Optional, List, Dict, Any
 import re
 import sys
+import warnings
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from cache_manager import CacheManager
+from forest_engine import INTERVAL_PERCENTILES, summarize_tree_outputs
+from model_loader import load_model_state
+from file_watcher import FileWatcher
+from demand_store import DemandStore, company_level_response
+from demand_cube import DemandCube
+from lru_cache import LRUCache
+from lazy_import import LazyModule
+from single_flight import SingleFlight
+from demand_score_index import DemandScoreIndex, validate_demand_score_data
+from serving_bundle import ServingBundle
+from micro_batcher import MicroBatcher
+from inference_pool import InferencePool, InferencePoolFull, InferencePoolStopped
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import threading
+import time
+
+# pandas and requests are only needed for the dataset and downloads, so keep them out of import time
+pd = LazyModule("pandas")
+requests = LazyModule("requests")
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -391,18 +416,58 @@ logger = logging.getLogger(__name__)
 # Model download configuration
 MODEL_PATH = os.path.join(os.path.dirname(__file__), "CarPriceModel.pkl")
 MODEL_GITHUB_URL = "https://raw.githubusercontent.com/ronittalreja/carvalue/main/backend/CarPriceModel.pkl"
+FEATURE_NAMES_PATH = os.path.join(os.path.dirname(__file__), "feature_names.pkl")
+FOREST_PATH = os.path.join(os.path.dirname(__file__), "CarPriceModel.forest.npz")
+
+# Inference engine: "sklearn" (model.predict) or "flat" (flattened forest from export_forest.py)
+PREDICTION_ENGINE = os.getenv("PREDICTION_ENGINE", "sklearn").lower().strip()
+
+# Prediction cache: size 0 disables it; a kms bucket > 0 rounds kms_driven to that step
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "10000"))
+PREDICTION_CACHE_TTL = float(os.getenv("PREDICTION_CACHE_TTL", "3600"))
+PREDICTION_CACHE_KMS_BUCKET = float(os.getenv("PREDICTION_CACHE_KMS_BUCKET", "0"))
+
+# Response caches for /demand-index and /api/demand-score: size 0 disables them
+DEMAND_CACHE_SIZE = int(os.getenv("DEMAND_CACHE_SIZE", "10000"))
+DEMAND_CACHE_TTL = float(os.getenv("DEMAND_CACHE_TTL", "3600"))
+
+# Opt-in micro-batching of concurrent /predict calls
+MICRO_BATCH_ENABLED = os.getenv("MICRO_BATCH_ENABLED", "false").lower() in ("1", "true", "yes")
+MICRO_BATCH_MAX_SIZE = int(os.getenv("MICRO_BATCH_MAX_SIZE", "32"))
+MICRO_BATCH_MAX_WAIT_MS = float(os.getenv("MICRO_BATCH_MAX_WAIT_MS", "5"))
+
+# Inference mode: "local" (in the API process) or "process" (pool of worker processes)
+INFERENCE_MODE = os.getenv("INFERENCE_MODE", "local").lower().strip()
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", str(os.cpu_count() or 1)))
+INFERENCE_QUEUE_DEPTH = int(os.getenv("INFERENCE_QUEUE_DEPTH", str(INFERENCE_WORKERS * 8)))
+
+# Hot model reload: poll interval for CarPriceModel.pkl (0 disables the watcher)
+MODEL_WATCH_INTERVAL = float(os.getenv("MODEL_WATCH_INTERVAL", "0"))
+# Poll interval for demand_score.json, which the demand score engine regenerates (0 disables the watcher)
+DEMAND_SCORE_WATCH_INTERVAL = float(os.getenv("DEMAND_SCORE_WATCH_INTERVAL", "60"))
+# Token for the /admin endpoints; they answer 404 while it is unset
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
 
 # JSON data files for companies and models
 COMPANIES_JSON_PATH = os.path.join(os.path.dirname(__file__), "companies.json")
 MODELS_JSON_PATH = os.path.join(os.path.dirname(__file__), "company_models.json")
 DEMAND_DATA_JSON_PATH = os.path.join(os.path.dirname(__file__), "demand_data.json")
+# Columnar demand data written by convert_to_demand_json.py; memory-mapped instead of parsing the JSON
+DEMAND_DATA_NPZ_PATH = os.path.join(os.path.dirname(__file__), "demand_data.npz")
+# Precomputed demand-index cells built by build_demand_cube.py
+DEMAND_CUBE_PATH = os.path.join(os.path.dirname(__file__), "demand_cube.npz")
+DATASET_PARQUET_PATH = os.path.join(os.path.dirname(__file__), "cars24.parquet")
+# Single-file bundle of all of the above written by build_serving_bundle.py; used instead of them while it is fresh
+SERVING_BUNDLE_PATH = os.getenv("SERVING_BUNDLE_PATH", os.path.join(os.path.dirname(__file__), "serving_bundle.npz"))
 
 # Dataset download configuration (GitHub raw URLs as fallback)
 DATASET_CSV_URL = "https://raw.githubusercontent.com/ronittalreja/carvalue/main/backend/cars24.csv"
 DATASET_PARQUET_URL = "https://raw.githubusercontent.com/ronittalreja/carvalue/main/backend/cars24.parquet"
 
 # Download model if not exists from GitHub
-if not os.path.exists(MODEL_PATH):
+def download_model():
+    if os.path.exists(MODEL_PATH):
+        return
     logger.info("Model file not found locally. Downloading from GitHub...")
     try:
         r = requests.get(MODEL_GITHUB_URL, stream=True, timeout=60)
@@ -415,8 +480,46 @@ if not os.path.exists(MODEL_PATH):
         logger.error(f"❌ Failed to download model from GitHub: {e}")
         logger.error("Prediction endpoint will not work without the model.")
 
+# Load artifacts, then start/stop background workers with the app
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global inference_pool
+    await load_artifacts()
+    if INFERENCE_MODE == "process" and active_model is not None:
+        try:
+            pool = InferencePool(
+                MODEL_PATH,
+                workers=INFERENCE_WORKERS,
+                max_queue_depth=INFERENCE_QUEUE_DEPTH,
+                engine=PREDICTION_ENGINE,
+                feature_names_path=FEATURE_NAMES_PATH,
+                forest_path=FOREST_PATH
+            )
+            # Workers load the same artifact as this process; spawning them blocks, so keep it off the event loop
+            bundle_path = serving_bundle.path if serving_bundle is not None and active_model.path == serving_bundle.path else None
+            await asyncio.get_running_loop().run_in_executor(None, pool.start, active_model.version, bundle_path)
+            inference_pool = pool
+        except Exception as e:
+            logger.error(f"Failed to start inference pool, predicting in-process: {e}")
+            inference_pool = None
+    if micro_batcher is not None:
+        micro_batcher.start()
+    if model_watcher is not None:
+        model_watcher.start()
+    if demand_score_watcher is not None:
+        demand_score_watcher.start()
+    yield
+    if demand_score_watcher is not None:
+        demand_score_watcher.stop()
+    if model_watcher is not None:
+        model_watcher.stop()
+    if micro_batcher is not None:
+        micro_batcher.stop()
+    if inference_pool is not None:
+        inference_pool.shutdown()
+
 # Create the FastAPI app instance
-app = FastAPI(title="Car Price Dashboard API")
+app = FastAPI(title="Car Price Dashboard API", lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -427,110 +530,256 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def json_safe(value):
+    """Replace inf/NaN (which JSON cannot encode) with their string form, recursively"""
+    if isinstance(value, float) and not math.isfinite(value):
+        return str(value)
+    if isinstance(value, dict):
+        return {key: json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [json_safe(item) for item in value]
+    return value
+
+# The default 422 handler echoes the rejected input, which fails to serialize for Infinity/NaN
+@app.exception_handler(RequestValidationError)
+async def validation_error_handler(request: Request, exc: RequestValidationError):
+    return JSONResponse(status_code=422, content={"detail": json_safe(jsonable_encoder(exc.errors()))})
+
 # =========================
 # GLOBAL VARIABLES
 # =========================
-model = None
-df = pd.DataFrame()
+# The serving model with its encoder and engine, swapped as one reference on reload
+active_model = None
+model_reload_lock = threading.Lock()
+model_watcher = None
+demand_score_watcher = None
+inference_pool = None
+# Loaded by load_dataset_artifacts(); None until then
+df = None
 cache_manager = CacheManager()
+prediction_cache = LRUCache(max_size=PREDICTION_CACHE_SIZE, ttl_seconds=PREDICTION_CACHE_TTL)
+demand_index_cache = LRUCache(max_size=DEMAND_CACHE_SIZE, ttl_seconds=DEMAND_CACHE_TTL)
+demand_score_cache = LRUCache(max_size=DEMAND_CACHE_SIZE, ttl_seconds=DEMAND_CACHE_TTL)
+# Identical concurrent cache misses share one computation
+demand_index_flight = SingleFlight()
+demand_score_flight = SingleFlight()
 
 # Load companies and models from JSON files
-companies_data = None
-company_models_data = None
-
-try:
-    with open(COMPANIES_JSON_PATH, 'r') as f:
-        companies_data = json.load(f)
-    logger.info(f"✅ Loaded {len(companies_data)} companies from JSON")
-    logger.info(f"Companies: {companies_data}")
-except Exception as e:
-    logger.warning(f"⚠️ Failed to load companies from JSON: {e}")
-    companies_data = []
-
-try:
-    with open(MODELS_JSON_PATH, 'r') as f:
-        company_models_data = json.load(f)
-    logger.info(f"✅ Loaded company models from JSON")
-    logger.info(f"Number of companies with models: {len(company_models_data)}")
-except Exception as e:
-    logger.warning(f"⚠️ Failed to load company models from JSON: {e}")
-    company_models_data = {}
-
-# Load demand data from JSON file
-demand_data = None
-try:
-    with open(DEMAND_DATA_JSON_PATH, 'r') as f:
-        demand_data = json.load(f)
-    logger.info(f"✅ Loaded {len(demand_data)} records from demand data JSON")
-except Exception as e:
-    logger.warning(f"⚠️ Failed to load demand data from JSON: {e}")
-    demand_data = []
+companies_data = []
+company_models_data = {}
+
+def load_companies_data():
+    global companies_data
+    try:
+        with open(COMPANIES_JSON_PATH, 'r') as f:
+            companies_data = json.load(f)
+        logger.info(f"✅ Loaded {len(companies_data)} companies from JSON")
+        logger.info(f"Companies: {companies_data}")
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to load companies from JSON: {e}")
+        companies_data = []
+        raise
+
+def load_company_models_data():
+    global company_models_data
+    try:
+        with open(MODELS_JSON_PATH, 'r') as f:
+            company_models_data = json.load(f)
+        logger.info(f"✅ Loaded company models from JSON")
+        logger.info(f"Number of companies with models: {len(company_models_data)}")
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to load company models from JSON: {e}")
+        company_models_data = {}
+        raise
+
+# Load demand data, preferring the memory-mapped columnar file over the JSON export
+def load_demand_data():
+    """Load the demand data and build its index (with per-company model counts)"""
+    if os.path.exists(DEMAND_DATA_NPZ_PATH):
+        source_path = DEMAND_DATA_NPZ_PATH
+        store = DemandStore.load(DEMAND_DATA_NPZ_PATH)
+        logger.info(f"✅ Memory-mapped {store.size} records from {os.path.basename(DEMAND_DATA_NPZ_PATH)}")
+    else:
+        source_path = DEMAND_DATA_JSON_PATH
+        with open(DEMAND_DATA_JSON_PATH, 'r') as f:
+            store = DemandStore.from_records(json.load(f))
+        logger.info(f"✅ Loaded {store.size} records from demand data JSON")
+    logger.info(f"✅ Built demand index: {len(store.group_bounds)} company/model groups")
+    return store, load_demand_cube(source_path)
+
+def load_demand_cube(source_path):
+    """Load demand_cube.npz if it exists and was built from the demand data file in use"""
+    if not os.path.exists(DEMAND_CUBE_PATH):
+        logger.info("Demand cube not found, serving /demand-index from the live index")
+        return None
+    try:
+        cube = DemandCube.load(DEMAND_CUBE_PATH, source_path)
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to load demand cube: {e}")
+        return None
+    if cube is not None:
+        logger.info(f"✅ Loaded demand cube: {cube.size} cells")
+    return cube
+
+def swap_demand_data(store, cube):
+    """Publish a new demand store and cube under the next generation and drop cached responses"""
+    global demand_store, demand_cube, demand_generation
+    with demand_swap_lock:
+        demand_store, demand_cube = store, cube
+        demand_generation += 1
+    demand_index_cache.clear()
+
+def demand_data_snapshot():
+    """The current (generation, store, cube), read together"""
+    with demand_swap_lock:
+        return demand_generation, demand_store, demand_cube
+
+def reload_demand_data():
+    """Rebuild the demand index from disk and swap it in; the old one keeps serving on failure"""
+    swap_demand_data(*load_demand_data())
+    return demand_store
+
+# Empty until the startup loader swaps in the real data
+demand_store = DemandStore.from_records([])
+demand_cube = None
+# Bumped on every swap; cache keys include it, so a response computed from
+# an old store during a reload can never be served for the new one
+demand_generation = 0
+demand_swap_lock = threading.Lock()
+
+def load_demand_artifacts():
+    try:
+        swap_demand_data(*load_demand_data())
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to load demand data: {e}")
+        raise
 
 # Cached data for fast access
 companies_cache = None
 models_cache = None
+transmissions_cache = None
+owners_cache = None
 
 # =========================
 # UTILITY FUNCTIONS
 # =========================
 def normalize_string(s):
     """Normalize string for comparison"""
-    if pd.isna(s) or s is None:
+    # Plain strings and numbers (every request field) skip the pandas NaN check
+    if isinstance(s, str):
+        return s.lower().strip()
+    if isinstance(s, (int, float)):
+        return "" if s != s else str(s).lower()
+    if s is None or pd.isna(s):
         return ""
     return str(s).lower().strip()
 
-def extract_numeric_owner(owner_str):
-    """Extract numeric value from owner string"""
-    if pd.isna(owner_str):
-        return None
-    
-    owner_str = str(owner_str).lower()
-    
-    # Extract numbers from string
-    numbers = re.findall(r'\d+', owner_str)
-    if numbers:
-        return int(numbers[0])
-    
-    # Handle special cases
-    if 'first' in owner_str or '1st' in owner_str:
-        return 1
-    elif 'second' in owner_str or '2nd' in owner_str:
-        return 2
-    elif 'third' in owner_str or '3rd' in owner_str:
-        return 3
-    elif 'fourth' in owner_str or '4th' in owner_str or '4+' in owner_str:
-        return 4
-    
-    return None
+# Owner counts spelled out in words, checked in this order when the value has no digits
+OWNER_WORDS = (
+    (1, ('first', '1st')),
+    (2, ('second', '2nd')),
+    (3, ('third', '3rd')),
+    (4, ('fourth', '4th', '4+')),
+)
+
+# Every character str.split() treats as whitespace, listed out so Python's re and Arrow's RE2 match the same runs
+WHITESPACE_RUN = "[\t-\r\x1c-\x1f \x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]+"
+
+def split_car_names(names):
+    """Split "Make Model Variant" names into normalized company and model columns.
+
+    The company is the first word and the model the remaining words joined
+    by single spaces; names without them get "unknown".
+    """
+    words = names.str.replace(WHITESPACE_RUN, " ", regex=True).str.strip(" ").str.lower()
+    company = words.str.replace(r" .*$", "", regex=True)
+    model = words.str.replace(r"^[^ ]* ?", "", regex=True)
+    return company.where(company != "", "unknown"), model.where(model != "", "unknown")
+
+def extract_numeric_owners(owners):
+    """Owner count from each owner value: its first number, else an OWNER_WORDS match, else NaN"""
+    if pd.api.types.is_integer_dtype(owners):
+        # str(-2) holds the number 2
+        counts = owners.abs()
+    else:
+        owner_strs = owners.astype(str).str.lower().where(owners.notna())
+        counts = pd.to_numeric(owner_strs.str.extract(r'(\d+)', expand=False))
+
+        # Only values without digits need the word table
+        unparsed = counts.isna() & owner_strs.notna()
+        if unparsed.any():
+            counts[unparsed] = np.select(
+                [owner_strs[unparsed].str.contains('|'.join(re.escape(word) for word in spellings)) for _, spellings in OWNER_WORDS],
+                [count for count, _ in OWNER_WORDS],
+                default=np.nan
+            )
+    # Whole-number column when every value parsed, like building it from Python ints
+    return counts.astype(np.int64) if counts.notna().all() else counts.astype(np.float64)
 
 # =========================
 # LOAD MODEL
 # =========================
-try:
-    with open(MODEL_PATH, "rb") as f:
-        model = pickle.load(f)
-    logger.info("Model loaded successfully")
-except FileNotFoundError:
-    logger.warning("Warning: CarPriceModel.pkl not found")
-except Exception as e:
-    logger.error(f"Error loading model: {e}")
+# Encoded rows are plain NumPy arrays laid out in feature_names_in_ order
+warnings.filterwarnings("ignore", message="X does not have valid feature names")
+
+def load_model():
+    """Load the model with its encoder and inference engine at startup"""
+    global active_model
+
+    try:
+        active_model = load_model_state(MODEL_PATH, FEATURE_NAMES_PATH, FOREST_PATH, PREDICTION_ENGINE)
+        logger.info(f"Model loaded successfully (version {active_model.version}, engine {active_model.engine})")
+    except FileNotFoundError:
+        logger.warning("Warning: CarPriceModel.pkl not found")
+    except Exception as e:
+        logger.error(f"Error loading model: {e}")
+
+    # Cached predictions belong to the previous model
+    prediction_cache.clear()
+
+def reload_model():
+    """Load and validate the model file off to the side, then swap it in atomically.
+
+    In-flight requests keep the reference they started with and finish on the old model.
+    Returns the new LoadedModel, or raises if the new file fails to load or validate
+    (the old model keeps serving in that case).
+    """
+    global active_model
+
+    with model_reload_lock:
+        new_model = load_model_state(MODEL_PATH, FEATURE_NAMES_PATH, FOREST_PATH, PREDICTION_ENGINE)
+        if inference_pool is not None and inference_pool.running:
+            inference_pool.restart(new_model.version)
+        old_version = active_model.version if active_model is not None else None
+        active_model = new_model
+        prediction_cache.clear()
+        logger.info(f"✅ Model reloaded: {old_version} -> {new_model.version}")
+        return new_model
+
+def load_model_artifact():
+    """Download the model if needed and load it; fails if no model ends up loaded"""
+    download_model()
+    load_model()
+    if active_model is None:
+        raise RuntimeError("Model not loaded")
+
+if MODEL_WATCH_INTERVAL > 0:
+    model_watcher = FileWatcher(MODEL_PATH, reload_model, MODEL_WATCH_INTERVAL)
 
 # =========================
 # DATA PREPROCESSING
 # =========================
-def preprocess_data():
-    """Preprocess the loaded dataset"""
-    global df
-    
-    if df.empty:
-        return
+def preprocess_data(data):
+    """Return a preprocessed copy of a freshly read dataset; `data` itself is left untouched"""
+    if data is None or data.empty:
+        return data
     
-    logger.info(f"Original dataset shape: {df.shape}")
-    logger.info(f"Columns: {df.columns.tolist()}")
+    logger.info(f"Original dataset shape: {data.shape}")
+    logger.info(f"Columns: {data.columns.tolist()}")
     
     # Rename columns to standard format (case-insensitive)
     column_mapping = {}
-    for col in df.columns:
+    for col in data.columns:
         col_lower = col.lower().strip()
         if 'year' in col_lower:
             column_mapping[col] = 'year'
@@ -547,87 +796,106 @@ def preprocess_data():
         elif any(word in col_lower for word in ['car', 'name', 'model']):
             column_mapping[col] = 'Car Name'
     
-    df.rename(columns=column_mapping, inplace=True)
+    data = data.rename(columns=column_mapping)
     logger.info(f"Renamed columns: {column_mapping}")
     
     # Ensure Car Name column exists
-    if 'Car Name' not in df.columns:
+    if 'Car Name' not in data.columns:
         # Try to find the most likely car name column
-        for col in df.columns:
-            if df[col].dtype == 'object' and df[col].str.contains(' ', na=False).any():
-                df['Car Name'] = df[col]
+        for col in data.columns:
+            if data[col].dtype == 'object' and data[col].str.contains(' ', na=False).any():
+                data['Car Name'] = data[col]
                 break
     
-    if 'Car Name' in df.columns:
+    if 'Car Name' in data.columns:
         # Drop rows with missing Car Name
-        df = df.dropna(subset=['Car Name'])
+        data = data.dropna(subset=['Car Name'])
         # Convert Car Name to string
-        df['Car Name'] = df['Car Name'].astype(str)
+        data['Car Name'] = data['Car Name'].astype(str)
         
-        # Extract company and model safely with better normalization
-        df['company'] = df['Car Name'].apply(
-            lambda x: normalize_string(x.split()[0]) if isinstance(x, str) and len(x.split()) > 0 else "unknown"
-        )
-        df['model'] = df['Car Name'].apply(
-            lambda x: normalize_string(' '.join(x.split()[1:])) if isinstance(x, str) and len(x.split()) > 1 else "unknown"
-        )
+        # Extract company and model with vectorized string ops
+        data['company'], data['model'] = split_car_names(data['Car Name'])
         
-        logger.info(f"Companies found: {df['company'].nunique()}")
-        logger.info(f"Models found: {df['model'].nunique()}")
+        logger.info(f"Companies found: {data['company'].nunique()}")
+        logger.info(f"Models found: {data['model'].nunique()}")
     
     # Clean numeric columns
     numeric_columns = ['year', 'kms_driven', 'price']
     for col in numeric_columns:
-        if col in df.columns:
+        if col in data.columns:
             # Convert to numeric, coerce errors to NaN
-            df[col] = pd.to_numeric(df[col], errors='coerce')
+            data[col] = pd.to_numeric(data[col], errors='coerce')
     
     # Special handling for owners column
-    if 'owners' in df.columns:
-        df['owners_numeric'] = df['owners'].apply(extract_numeric_owner)
-        df['owners_str'] = df['owners'].apply(normalize_string)
+    if 'owners' in data.columns:
+        data['owners_numeric'] = extract_numeric_owners(data['owners'])
+        data['owners_str'] = data['owners'].astype(str).str.lower().str.strip().where(data['owners'].notna(), "")
     
     # Clean categorical columns
     categorical_columns = ['fuel_type', 'transmission']
     for col in categorical_columns:
-        if col in df.columns:
+        if col in data.columns:
             # Convert to lowercase and strip whitespace
-            df[col] = df[col].astype(str).str.lower().str.strip()
+            data[col] = data[col].astype(str).str.lower().str.strip()
     
-    logger.info(f"Preprocessed dataset shape: {df.shape}")
+    logger.info(f"Preprocessed dataset shape: {data.shape}")
     
     # Debug: Show sample data
-    if 'company' in df.columns and 'model' in df.columns:
-        logger.info(f"Sample companies: {df['company'].value_counts().head().to_dict()}")
-        logger.info(f"Sample models for first company: {df[df['company'] == df['company'].iloc[0]]['model'].value_counts().head().to_dict()}")
+    if 'company' in data.columns and 'model' in data.columns:
+        logger.info(f"Sample companies: {data['company'].value_counts().head().to_dict()}")
+        logger.info(f"Sample models for first company: {data[data['company'] == data['company'].iloc[0]]['model'].value_counts().head().to_dict()}")
+
+    return data
 
 # =========================
 # CACHE BUILDING
 # =========================
+def dataset_catalog():
+    """Companies, models per company, transmissions and owner counts found in the preprocessed dataset"""
+    catalog = {"companies": None, "models": None, "transmissions": None, "owners": None}
+
+    if 'company' in df.columns:
+        companies = df['company'].unique().tolist()
+        companies = [c for c in companies if c != 'unknown' and c != '' and pd.notna(c)]
+        catalog["companies"] = sorted(companies)
+
+    if 'company' in df.columns and 'model' in df.columns:
+        models_dict = {}
+        for company in catalog["companies"]:
+            models = df[df['company'] == company]['model'].unique().tolist()
+            models = [m for m in models if m != 'unknown' and m != '' and pd.notna(m)]
+            models_dict[company] = sorted(models)
+        catalog["models"] = models_dict
+
+    if 'transmission' in df.columns:
+        transmissions = df['transmission'].dropna().unique().tolist()
+        catalog["transmissions"] = sorted(set(normalize_string(t) for t in transmissions if pd.notna(t) and t != ''))
+
+    if 'owners_numeric' in df.columns:
+        owners = df['owners_numeric'].dropna().unique().tolist()
+        catalog["owners"] = sorted(int(o) for o in owners if pd.notna(o))
+
+    return catalog
+
 def build_cache():
     """Build cache for companies and models"""
     global companies_cache, models_cache
     
-    if df.empty:
+    if df is None or df.empty:
         logger.warning("Cannot build cache: dataset is empty")
         return
     
     try:
+        catalog = dataset_catalog()
+
         # Build companies cache
-        if 'company' in df.columns:
-            companies = df['company'].unique().tolist()
-            companies = [c for c in companies if c != 'unknown' and c != '' and pd.notna(c)]
-            companies_cache = sorted(companies)
+        if catalog["companies"] is not None:
+            companies_cache = catalog["companies"]
             cache_manager.save_companies(companies_cache)
         
         # Build models cache
-        if 'company' in df.columns and 'model' in df.columns:
-            models_dict = {}
-            for company in companies_cache:
-                models = df[df['company'] == company]['model'].unique().tolist()
-                models = [m for m in models if m != 'unknown' and m != '' and pd.notna(m)]
-                models_dict[company] = sorted(models)
-            models_cache = models_dict
+        if catalog["models"] is not None:
+            models_cache = catalog["models"]
             cache_manager.save_models(models_cache)
         
         # Save metadata
@@ -665,8 +933,8 @@ def load_from_cache():
 # =========================
 # LOAD DATASET
 # =========================
-def load_dataset():
-    global df
+def read_dataset():
+    """Read the raw dataset from Parquet/CSV (downloading it if needed); None if it can't be read"""
     try:
         # Get the directory where this script is located
         script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -683,22 +951,22 @@ def load_dataset():
         if os.path.exists(DATA_PATH):
             logger.info("Loading from Parquet file...")
             try:
-                df = pd.read_parquet(DATA_PATH, engine="pyarrow")
-                logger.info(f"✅ Dataset loaded from Parquet with {len(df)} rows and {len(df.columns)} columns")
+                data = pd.read_parquet(DATA_PATH, engine="pyarrow")
+                logger.info(f"✅ Dataset loaded from Parquet with {len(data)} rows and {len(data.columns)} columns")
             except ImportError as e:
                 logger.warning(f"Pyarrow not installed, falling back to CSV: {e}")
                 if os.path.exists(CSV_PATH):
                     logger.info("Loading from CSV file...")
-                    df = pd.read_csv(CSV_PATH, engine="python", on_bad_lines="skip", encoding="utf-8")
-                    logger.info(f"✅ Dataset loaded from CSV with {len(df)} rows and {len(df.columns)} columns")
+                    data = pd.read_csv(CSV_PATH, engine="python", on_bad_lines="skip", encoding="utf-8")
+                    logger.info(f"✅ Dataset loaded from CSV with {len(data)} rows and {len(data.columns)} columns")
                 else:
                     logger.error("CSV file not found for fallback")
-                    return False
+                    return None
         elif os.path.exists(CSV_PATH):
             # Fallback to CSV
             logger.info("Parquet file not found, loading from CSV...")
-            df = pd.read_csv(CSV_PATH, engine="python", on_bad_lines="skip", encoding="utf-8")
-            logger.info(f"✅ Dataset loaded from CSV with {len(df)} rows and {len(df.columns)} columns")
+            data = pd.read_csv(CSV_PATH, engine="python", on_bad_lines="skip", encoding="utf-8")
+            logger.info(f"✅ Dataset loaded from CSV with {len(data)} rows and {len(data.columns)} columns")
         else:
             # Fallback: download from GitHub
             logger.warning("Neither Parquet nor CSV file found locally. Attempting to download from GitHub...")
@@ -712,8 +980,8 @@ def load_dataset():
                     f.write(response.content)
                 logger.info(f"✅ Downloaded Parquet file to {DATA_PATH}")
                 
-                df = pd.read_parquet(DATA_PATH, engine="pyarrow")
-                logger.info(f"✅ Dataset loaded from downloaded Parquet with {len(df)} rows and {len(df.columns)} columns")
+                data = pd.read_parquet(DATA_PATH, engine="pyarrow")
+                logger.info(f"✅ Dataset loaded from downloaded Parquet with {len(data)} rows and {len(data.columns)} columns")
                 
             except Exception as download_error:
                 logger.warning(f"Failed to download Parquet: {download_error}")
@@ -727,42 +995,55 @@ def load_dataset():
                         f.write(response.content)
                     logger.info(f"✅ Downloaded CSV file to {CSV_PATH}")
                     
-                    df = pd.read_csv(CSV_PATH, engine="python", on_bad_lines="skip", encoding="utf-8")
-                    logger.info(f"✅ Dataset loaded from downloaded CSV with {len(df)} rows and {len(df.columns)} columns")
+                    data = pd.read_csv(CSV_PATH, engine="python", on_bad_lines="skip", encoding="utf-8")
+                    logger.info(f"✅ Dataset loaded from downloaded CSV with {len(data)} rows and {len(data.columns)} columns")
                     
                 except Exception as csv_download_error:
                     logger.error(f"Failed to download CSV: {csv_download_error}")
                     logger.error("❌ Unable to load dataset from any source")
-                    return False
+                    return None
 
         # Fix duplicate column names
-        if df.columns.duplicated().any():
-            df = df.loc[:, ~df.columns.duplicated()]
+        if data.columns.duplicated().any():
+            data = data.loc[:, ~data.columns.duplicated()]
             logger.warning("Duplicate columns found and removed")
 
         # Optional: rename 'Unnamed: 0' to 'index' if present
-        if "Unnamed: 0" in df.columns:
-            df.rename(columns={"Unnamed: 0": "index"}, inplace=True)
+        if "Unnamed: 0" in data.columns:
+            data.rename(columns={"Unnamed: 0": "index"}, inplace=True)
 
-        logger.info(f"Columns after cleaning: {df.columns.tolist()}")
+        logger.info(f"Columns after cleaning: {data.columns.tolist()}")
 
-        return True
+        return data
     except Exception as e:
         logger.error(f"❌ Failed to load dataset: {e}")
         import traceback
         logger.error(traceback.format_exc())
-        df = pd.DataFrame()
+        return None
+
+def load_dataset():
+    """Read and preprocess the dataset, then publish it as df in one assignment.
+
+    Readers treat df as not loaded until then, instead of seeing the raw
+    columns while preprocessing is still adding company/model/owners_*.
+    """
+    global df
+    data = read_dataset()
+    if data is None:
         return False
+    df = preprocess_data(data)
+    return True
 
 # Load dataset when server starts
-if load_dataset():
-    preprocess_data()
-    # Build and cache companies/models
-    build_cache()
-else:
-    logger.warning("Dataset not loaded at startup. Endpoints will return errors until fixed.")
-    # Try to load from cache if dataset fails
-    load_from_cache()
+def load_dataset_artifacts():
+    if load_dataset():
+        # Build and cache companies/models
+        build_cache()
+    else:
+        logger.warning("Dataset not loaded at startup. Endpoints will return errors until fixed.")
+        # Try to load from cache if dataset fails
+        if not load_from_cache():
+            raise RuntimeError("Dataset and cache both unavailable")
 
 # =========================
 # PYDANTIC MODELS
@@ -771,7 +1052,7 @@ class CarRequest(BaseModel):
     company: str = Field(..., min_length=1)
     car_model: str = Field(..., min_length=1)
     year: int = Field(..., ge=1900, le=2030)
-    kms_driven: float = Field(..., ge=0)
+    kms_driven: float = Field(..., ge=0, allow_inf_nan=False)
     fuel_type: str
     transmission: str
     owners: int = Field(..., ge=1, le=10)
@@ -782,54 +1063,282 @@ class CarRequest(BaseModel):
 # =========================
 # PREDICTION ENDPOINT
 # =========================
+class BatchPredictRequest(BaseModel):
+    cars: List[Dict[str, Any]]
+
+# Upper bound on cars accepted by a single /predict/batch call
+MAX_BATCH_SIZE = 5000
+
+class DepreciationCurveRequest(BaseModel):
+    car: CarRequest
+    year_min: Optional[int] = Field(None, ge=1900, le=2030)
+    year_max: Optional[int] = Field(None, ge=1900, le=2030)
+    year_step: int = Field(1, ge=1)
+    kms_min: Optional[float] = Field(None, ge=0, allow_inf_nan=False)
+    kms_max: Optional[float] = Field(None, ge=0, allow_inf_nan=False)
+    kms_step: float = Field(10000, gt=0, allow_inf_nan=False)
+
+# Upper bound on (year, kms) grid points for /predict/depreciation-curve
+MAX_CURVE_POINTS = 2000
+
+def build_input_data(car: CarRequest) -> Dict[str, Any]:
+    """Map a car request to the training column layout"""
+    return {
+        "company": normalize_string(car.company),
+        "car_model": normalize_string(car.car_model),
+        "year": car.year,
+        "kms_driven": car.kms_driven,
+        "fuel_type": normalize_string(car.fuel_type),
+        "transmission": normalize_string(car.transmission),
+        "owners": car.owners,
+        "service_history": car.service_history,
+        "previous_accidents": car.previous_accidents,
+        "insurance": normalize_string(car.insurance)
+    }
+
+def encode_features(rows: List[Dict[str, Any]], state=None):
+    """One-hot encode input rows and align them with the model's feature columns"""
+    state = state or active_model
+    return state.encoder.encode_many(rows)
+
+def prediction_cache_key(input_data: Dict[str, Any], version: str) -> tuple:
+    """Cache key built from the model version and the normalized request fields"""
+    return (
+        version,
+        input_data["company"],
+        input_data["car_model"],
+        input_data["year"],
+        input_data["kms_driven"],
+        input_data["fuel_type"],
+        input_data["transmission"],
+        input_data["owners"],
+        input_data["service_history"],
+        input_data["previous_accidents"],
+        input_data["insurance"]
+    )
+
+def predict_matrix(X, state=None):
+    """Run the configured inference engine on an encoded feature matrix"""
+    state = state or active_model
+    return state.predict_matrix(X)
+
+def predict_rows(rows: List[Dict[str, Any]]):
+    """Encode and predict a list of input rows in one call"""
+    if inference_pool is not None and inference_pool.running:
+        try:
+            return inference_pool.predict(rows)
+        except InferencePoolStopped:
+            pass  # shut down since the check above; predict in this process
+    # One reference for the whole call so a concurrent reload can't mix models
+    state = active_model
+    return predict_matrix(encode_features(rows, state), state)
+
+def predict_rows_with_intervals(rows: List[Dict[str, Any]]):
+    """Encode rows and return [mean, p10, p50, p90] per row from every tree's output.
+
+    Per-tree outputs come from one forest traversal (flat engine) or one model.apply() call,
+    never from a Python loop over estimators. Latency budget versus plain prediction:
+    at most 1 ms extra for a single row and at most 25% extra for a batch.
+    """
+    if inference_pool is not None and inference_pool.running:
+        try:
+            return inference_pool.predict_with_intervals(rows)
+        except InferencePoolStopped:
+            pass  # shut down since the check above; predict in this process
+    state = active_model
+    return summarize_tree_outputs(state.predict_trees(encode_features(rows, state)))
+
+def format_interval(summary) -> Dict[str, float]:
+    """Turn a [mean, p10, p50, p90] row into the response's interval object"""
+    return {f"p{p}": round(float(value), 2) for p, value in zip(INTERVAL_PERCENTILES, summary[1:])}
+
+micro_batcher = MicroBatcher(
+    predict_rows,
+    max_batch_size=MICRO_BATCH_MAX_SIZE,
+    max_wait_ms=MICRO_BATCH_MAX_WAIT_MS
+) if MICRO_BATCH_ENABLED else None
+
 @app.post("/predict")
-def predict_price(car: CarRequest):
+def predict_price(car: CarRequest, interval: bool = Query(False)):
     logger.info(f"Prediction request received: {car}")
     
-    if model is None:
+    if active_model is None:
         logger.error("Model not loaded")
         raise HTTPException(status_code=500, detail="Model not loaded")
     
-    logger.info(f"Model loaded successfully. Feature names: {model.feature_names_in_}")
+    logger.info(f"Model loaded successfully. Feature names: {active_model.encoder.feature_names}")
     
     try:
         # Map request data to match training columns
-        input_data = {
-            "company": normalize_string(car.company),
-            "car_model": normalize_string(car.car_model),
-            "year": car.year,
-            "kms_driven": car.kms_driven,
-            "fuel_type": normalize_string(car.fuel_type),
-            "transmission": normalize_string(car.transmission),
-            "owners": car.owners,
-            "service_history": car.service_history,
-            "previous_accidents": car.previous_accidents,
-            "insurance": normalize_string(car.insurance)
-        }
+        input_data = build_input_data(car)
 
-        logger.info(f"Input data: {input_data}")
+        # Snap kms_driven to its bucket so every request in the bucket shares one prediction
+        if PREDICTION_CACHE_KMS_BUCKET > 0:
+            input_data["kms_driven"] = round(input_data["kms_driven"] / PREDICTION_CACHE_KMS_BUCKET) * PREDICTION_CACHE_KMS_BUCKET
 
-        input_df = pd.DataFrame([input_data])
+        logger.info(f"Input data: {input_data}")
 
-        # One-hot encode categorical features
-        X = pd.get_dummies(input_df)
-        logger.info(f"One-hot encoded features: {X.columns.tolist()}")
+        if interval:
+            summary = predict_rows_with_intervals([input_data])[0]
+            logger.info(f"Predicted price with interval: {summary}")
+            return {"prediction": round(float(summary[0]), 2), "interval": format_interval(summary)}
 
-        # Make sure all features expected by model are present
-        X = X.reindex(columns=model.feature_names_in_, fill_value=0)
-        logger.info(f"Reindexed features: {X.shape}")
+        cache_key = prediction_cache_key(input_data, active_model.version)
+        cached_prediction = prediction_cache.get(cache_key)
+        if cached_prediction is not None:
+            logger.info(f"Prediction cache hit: {cached_prediction}")
+            return {"prediction": cached_prediction}
 
-        predicted_price = model.predict(X)[0]
+        if micro_batcher is not None and micro_batcher.running:
+            # Share one vectorized predict with other requests arriving at the same time
+            predicted_price = micro_batcher.predict(input_data)
+        else:
+            predicted_price = predict_rows([input_data])[0]
         logger.info(f"Predicted price: {predicted_price}")
 
-        return {"prediction": round(predicted_price, 2)}
+        prediction = round(float(predicted_price), 2)
+        prediction_cache.set(cache_key, prediction)
+        return {"prediction": prediction}
     
+    except InferencePoolFull as e:
+        logger.warning(f"Prediction rejected: {e}")
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"Prediction error: {e}")
         import traceback
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
 
+@app.post("/predict/batch")
+def predict_price_batch(batch: BatchPredictRequest, interval: bool = Query(False)):
+    """Predict prices for many cars with a single encode and model call"""
+    if active_model is None:
+        logger.error("Model not loaded")
+        raise HTTPException(status_code=500, detail="Model not loaded")
+
+    if not batch.cars:
+        raise HTTPException(status_code=400, detail="No cars provided")
+    if len(batch.cars) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch too large: {len(batch.cars)} cars (max {MAX_BATCH_SIZE})"
+        )
+
+    logger.info(f"Batch prediction request received: {len(batch.cars)} cars")
+
+    # Validate each car on its own so one bad item doesn't fail the batch
+    results: List[Dict[str, Any]] = [None] * len(batch.cars)
+    valid_indices = []
+    valid_rows = []
+    for i, item in enumerate(batch.cars):
+        try:
+            car = CarRequest(**item)
+        except ValidationError as e:
+            errors = "; ".join(
+                f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()
+            )
+            results[i] = {"index": i, "error": f"Invalid request: {errors}"}
+            continue
+        valid_indices.append(i)
+        valid_rows.append(build_input_data(car))
+
+    if valid_rows:
+        try:
+            if interval:
+                summaries = predict_rows_with_intervals(valid_rows)
+                for i, summary in zip(valid_indices, summaries):
+                    results[i] = {
+                        "index": i,
+                        "prediction": round(float(summary[0]), 2),
+                        "interval": format_interval(summary)
+                    }
+            else:
+                predictions = predict_rows(valid_rows)
+                for i, predicted_price in zip(valid_indices, predictions):
+                    results[i] = {"index": i, "prediction": round(float(predicted_price), 2)}
+        except InferencePoolFull as e:
+            logger.warning(f"Batch prediction rejected: {e}")
+            raise HTTPException(status_code=503, detail=str(e))
+        except Exception as e:
+            logger.error(f"Batch prediction error: {e}")
+            import traceback
+            logger.error(traceback.format_exc())
+            for i in valid_indices:
+                results[i] = {"index": i, "error": f"Prediction error: {str(e)}"}
+
+    failed = sum(1 for r in results if "error" in r)
+    logger.info(f"Batch prediction complete: {len(results) - failed} succeeded, {failed} failed")
+
+    return {
+        "predictions": results,
+        "total": len(results),
+        "succeeded": len(results) - failed,
+        "failed": failed
+    }
+
+@app.post("/predict/depreciation-curve")
+def predict_depreciation_curve(request: DepreciationCurveRequest):
+    """Predict prices over a grid of registration years and odometer readings with one model call"""
+    if active_model is None:
+        logger.error("Model not loaded")
+        raise HTTPException(status_code=500, detail="Model not loaded")
+
+    car = request.car
+    year_min = request.year_min if request.year_min is not None else car.year
+    year_max = request.year_max if request.year_max is not None else car.year
+    kms_min = request.kms_min if request.kms_min is not None else car.kms_driven
+    kms_max = request.kms_max if request.kms_max is not None else car.kms_driven
+
+    if year_min > year_max:
+        raise HTTPException(status_code=400, detail="year_min must not be greater than year_max")
+    if kms_min > kms_max:
+        raise HTTPException(status_code=400, detail="kms_min must not be greater than kms_max")
+
+    # Check the grid size before building it so huge ranges are rejected cheaply; the kms
+    # count stays a float until then, since a tiny step over a huge range can overflow to inf
+    year_count = (year_max - year_min) // request.year_step + 1
+    kms_count = (kms_max - kms_min) // request.kms_step + 1
+    if year_count * kms_count > MAX_CURVE_POINTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Grid too large: {year_count} years x {kms_count:.0f} kms values (max {MAX_CURVE_POINTS} points)"
+        )
+    kms_count = int(kms_count)
+
+    years = list(range(year_min, year_max + 1, request.year_step))
+    kms_values = [kms_min + i * request.kms_step for i in range(kms_count)]
+
+    try:
+        base_input = build_input_data(car)
+        rows = [
+            dict(base_input, year=year, kms_driven=kms)
+            for year in years
+            for kms in kms_values
+        ]
+        predictions = predict_rows(rows)
+
+        prices = [
+            [round(float(p), 2) for p in predictions[i * len(kms_values):(i + 1) * len(kms_values)]]
+            for i in range(len(years))
+        ]
+        logger.info(f"Depreciation curve computed: {len(years)} years x {len(kms_values)} kms values")
+
+        return {
+            "years": years,
+            "kms_driven": kms_values,
+            "prices": prices,
+            "points": len(rows)
+        }
+
+    except InferencePoolFull as e:
+        logger.warning(f"Depreciation curve rejected: {e}")
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error(f"Depreciation curve error: {e}")
+        import traceback
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+
 # =========================
 # DATA ENDPOINTS
 # =========================
@@ -856,7 +1365,7 @@ def get_companies():
             return {"companies": companies_cache}
 
     # Fallback to dataframe
-    if df.empty:
+    if df is None or df.empty:
         logger.warning("Dataset not loaded, returning empty companies list")
         return {"companies": []}
 
@@ -892,7 +1401,7 @@ def get_models(company: str):
             return {"company": company_norm, "models": models_cache[company_norm]}
     
     # Fallback to dataframe
-    if df.empty:
+    if df is None or df.empty:
         logger.warning(f"Dataset not loaded for company {company_norm}, returning empty models list")
         return {"company": company_norm, "models": []}
     
@@ -912,8 +1421,12 @@ def get_models(company: str):
 
 @app.get("/transmissions")
 def get_transmissions():
+    # Values from the serving bundle's catalog
+    if transmissions_cache:
+        return {"transmissions": transmissions_cache}
+
     # Return default options if dataset not loaded
-    if df.empty:
+    if df is None or df.empty:
         logger.warning("Dataset not loaded, returning default transmission options")
         return {"transmissions": ["manual", "automatic"]}
     
@@ -933,8 +1446,12 @@ def get_transmissions():
 
 @app.get("/owners")
 def get_owners():
+    # Values from the serving bundle's catalog
+    if owners_cache:
+        return {"owners": owners_cache}
+
     # Return default options if dataset not loaded
-    if df.empty:
+    if df is None or df.empty:
         logger.warning("Dataset not loaded, returning default owner options")
         return {"owners": [1, 2, 3, 4]}
     
@@ -959,197 +1476,151 @@ def demand_index(
     transmission: Optional[str] = Query(None),
     ownership: Optional[str] = Query(None),
     year: Optional[int] = Query(None),
-    fuel_type: Optional[str] = Query(None)
+    fuel_type: Optional[str] = Query(None),
+    year_min: Optional[int] = Query(None, description="Only count cars from this year onwards"),
+    year_max: Optional[int] = Query(None, description="Only count cars up to this year")
 ):
-    if not demand_data:
+    generation, store, cube = demand_data_snapshot()
+    if not store.size:
         raise HTTPException(status_code=500, detail="Demand data not loaded")
-
-    company_norm = normalize_string(company)
-    model_norm = normalize_string(model)
+    if year_min is not None and year_max is not None and year_min > year_max:
+        raise HTTPException(status_code=400, detail="year_min must not be greater than year_max")
+
+    # Keyed on the data generation too, so a response computed during a reload never outlives it
+    cache_key = (generation,) + tuple(
+        normalize_string(value) for value in (company, model, transmission, ownership, year, fuel_type, year_min, year_max)
+    )
+    cached = demand_index_cache.get(cache_key)
+    if cached is not None:
+        return restamp_demand_index(cached, company, model, transmission, ownership)
+
+    def compute():
+        # Common filter combinations come straight from the cube, everything else from the live index
+        response = None
+        if cube is not None and year_min is None and year_max is None:
+            response = cube.demand_index(company, model, transmission, ownership, year, fuel_type)
+        if response is None:
+            response = store.demand_index(company, model, transmission, ownership, year, fuel_type, year_min, year_max)
+        demand_index_cache.set(cache_key, response)
+        return response
 
     try:
-        # Start with company and model filter using JSON data
-        matches = [
-            car for car in demand_data 
-            if car['company'] == company_norm and car['car_model'] == model_norm
-        ]
-
-        # Apply transmission filter if provided
-        if transmission:
-            transmission_norm = normalize_string(transmission)
-            matches = [car for car in matches if car.get('transmission') == transmission_norm]
-
-        # Apply ownership filter if provided  
-        if ownership:
-            try:
-                ownership_num = int(ownership)
-                matches = [car for car in matches if car.get('owners') == ownership_num]
-            except (ValueError, TypeError):
-                pass
-
-        # Apply year filter if provided (with range tolerance)
-        if year:
-            year_range = 2  # Allow ±2 years
-            matches = [car for car in matches if abs(car.get('year', 0) - year) <= year_range]
-
-        # Apply fuel type filter if provided
-        if fuel_type:
-            fuel_norm = normalize_string(fuel_type)
-            matches = [car for car in matches if car.get('fuel_type') == fuel_norm]
-
-        # If no exact matches, try fuzzy matching for model name
-        if not matches:
-            # Try to find similar models in the same company
-            company_cars = [car for car in demand_data if car['company'] == company_norm]
-            if company_cars:
-                # Check if any model contains the search term
-                model_search = model_norm.split()[0] if model_norm.split() else model_norm
-                similar_models = [car for car in company_cars if model_search in car.get('car_model', '')]
-                if similar_models:
-                    matches = similar_models
-                    logger.info(f"Using fuzzy match for model: {model_norm} -> {similar_models[0]['car_model']}")
-
-        # If still no matches, use company-level data as fallback
-        if not matches:
-            company_cars = [car for car in demand_data if car['company'] == company_norm]
-            if company_cars:
-                matches = company_cars
-                logger.info(f"Using company-level data for: {company_norm}")
-                return {
-                    "company": company,
-                    "model": model,
-                    "transmission": transmission if transmission else "any",
-                    "ownership": ownership if ownership else "any",
-                    "demand_index": 50.0,  # Neutral score for company-level estimate
-                    "confidence_score": 30.0,  # Low confidence due to lack of specific data
-                    "message": f"No specific data for {model}. Using company-level demand estimate for {company}.",
-                    "metrics": {
-                        "matches_count": len(company_cars),
-                        "company_total": len(company_cars),
-                        "sample_size": len(company_cars),
-                        "data_freshness": "company_level"
-                    },
-                    "breakdown": {
-                        "base_popularity": 50.0,
-                        "transmission_adjustment": 0.0,
-                        "ownership_adjustment": 0.0,
-                        "year_adjustment": 0.0
-                    },
-                    "analysis": {
-                        "insight": f"Based on overall demand for {company} vehicles",
-                        "recommendation": "Consider adding more specific car data for accurate predictions"
-                    }
-                }
+        response = demand_index_flight.do(cache_key, compute)
+        # Waiters may have spelled the parameters differently from the caller that computed it
+        return restamp_demand_index(response, company, model, transmission, ownership)
+    except Exception as e:
+        logger.error(f"Demand index calculation error: {e}")
+        # Return user-friendly error instead of 500
+        return demand_index_error_response(company, model, transmission, ownership)
 
-        # Calculate demand index with improved methodology
-        company_cars = [car for car in demand_data if car['company'] == company_norm]
-        
-        # Base popularity score
-        model_counts = {}
-        for car in company_cars:
-            model_name = car.get('car_model', '')
-            model_counts[model_name] = model_counts.get(model_name, 0) + 1
-        max_count_in_company = max(model_counts.values()) if model_counts else 1
-        base_popularity = (len(matches) / max_count_in_company) * 100
-        
-        # Confidence score based on sample size
-        sample_size = len(matches)
-        company_total = len(company_cars)
-        
-        # Higher confidence with larger sample sizes
-        if sample_size >= 100:
-            confidence = 0.95
-        elif sample_size >= 50:
-            confidence = 0.85
-        elif sample_size >= 20:
-            confidence = 0.70
-        elif sample_size >= 10:
-            confidence = 0.50
-        else:
-            confidence = 0.30
-        
-        # Adjust demand index based on year (newer cars might have different demand patterns)
-        if matches:
-            years = [car.get('year', 0) for car in matches if car.get('year')]
-            if years:
-                avg_year = sum(years) / len(years)
-                current_year = 2025  # Update this dynamically
-                year_factor = 1.0
-                
-                # Slight boost for cars 3-7 years old (sweet spot for used cars)
-                if 3 <= (current_year - avg_year) <= 7:
-                    year_factor = 1.1
-                # Penalty for very old cars (>10 years)
-                elif (current_year - avg_year) > 10:
-                    year_factor = 0.9
-                
-                base_popularity *= year_factor
-        
-        # Normalize to 0-100 range
-        demand_index = max(1, min(100, round(base_popularity, 1)))
-        
-        # Build breakdown
-        breakdown = {
-            "sample_size": sample_size,
-            "company_market_share": round((sample_size / company_total) * 100, 2) if company_total > 0 else 0,
-            "base_popularity_score": round(base_popularity, 2)
-        }
-        
-        # Build analysis
-        analysis = {
-            "demand_level": "High" if demand_index >= 70 else "Medium" if demand_index >= 40 else "Low",
-            "data_reliability": "High" if confidence >= 0.85 else "Medium" if confidence >= 0.50 else "Low",
-            "market_position": f"Top {min(10, round((sample_size / max_count_in_company) * 100))}%" if max_count_in_company > 0 else "Unknown"
-        }
+def restamp_demand_index(response, company, model, transmission, ownership):
+    """Echo this request's spelling of the parameters in a cached response"""
+    if response["metrics"]["data_freshness"] == "company_level":
+        return company_level_response(company, model, transmission, ownership, response["metrics"]["company_total"])
+    return {
+        **response,
+        "company": company,
+        "model": model,
+        "transmission": transmission if transmission else "any",
+        "ownership": ownership if ownership else "any"
+    }
 
-        return {
-            "company": company,
-            "model": model,
-            "transmission": transmission if transmission else "any",
-            "ownership": ownership if ownership else "any",
-            "demand_index": float(demand_index),
-            "confidence_score": round(confidence, 2),
-            "message": f"Demand index calculated with {round(confidence * 100)}% confidence based on {sample_size} data points",
-            "metrics": {
-                "matches_count": sample_size,
-                "company_total": company_total,
-                "sample_size": sample_size,
-                "data_freshness": "static_dataset"
-            },
-            "breakdown": breakdown,
-            "analysis": analysis
-        }
+def demand_index_error_response(company, model, transmission, ownership):
+    return {
+        "company": company,
+        "model": model,
+        "transmission": transmission if transmission else "any",
+        "ownership": ownership if ownership else "any",
+        "demand_index": 0.0,
+        "confidence_score": 0.0,
+        "message": "Unable to calculate demand index. Please try again.",
+        "metrics": {
+            "matches_count": 0,
+            "company_total": 0,
+            "sample_size": 0,
+            "data_freshness": "unknown"
+        },
+        "breakdown": {},
+        "analysis": {}
+    }
 
+class DemandIndexQuery(BaseModel):
+    # Accept {"ownership": 1} like the GET endpoint's ?ownership=1, which arrives as "1"
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+    company: str
+    model: str
+    transmission: Optional[str] = None
+    ownership: Optional[str] = None
+    year: Optional[int] = None
+    fuel_type: Optional[str] = None
+    year_min: Optional[int] = None
+    year_max: Optional[int] = None
+
+class DemandIndexBatchRequest(BaseModel):
+    cars: List[DemandIndexQuery]
+
+@app.post("/demand-index/batch")
+def demand_index_batch(request: DemandIndexBatchRequest):
+    """Demand index for many cars at once; results are in input order with the single-endpoint shape"""
+    if not demand_store.size:
+        raise HTTPException(status_code=500, detail="Demand data not loaded")
+    if len(request.cars) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Batch size exceeds the limit of {MAX_BATCH_SIZE} cars")
+    for i, car in enumerate(request.cars):
+        if car.year_min is not None and car.year_max is not None and car.year_min > car.year_max:
+            raise HTTPException(status_code=400, detail=f"cars[{i}]: year_min must not be greater than year_max")
+
+    queries = [car.model_dump() for car in request.cars]
+    results = [None] * len(queries)
+
+    # Answer what the cube covers, then score the rest grouped by (company, model)
+    cube = demand_cube
+    remaining = []
+    for i, query in enumerate(queries):
+        if cube is not None and query["year_min"] is None and query["year_max"] is None:
+            results[i] = cube.demand_index(
+                query["company"], query["model"], query["transmission"],
+                query["ownership"], query["year"], query["fuel_type"]
+            )
+        if results[i] is None:
+            remaining.append(i)
+
+    store = demand_store
+    try:
+        for i, response in zip(remaining, store.demand_index_many([queries[i] for i in remaining])):
+            results[i] = response
     except Exception as e:
-        logger.error(f"Demand index calculation error: {e}")
-        # Return user-friendly error instead of 500
-        return {
-            "company": company,
-            "model": model,
-            "transmission": transmission if transmission else "any",
-            "ownership": ownership if ownership else "any",
-            "demand_index": 0.0,
-            "confidence_score": 0.0,
-            "message": "Unable to calculate demand index. Please try again.",
-            "metrics": {
-                "matches_count": 0,
-                "company_total": 0,
-                "sample_size": 0,
-                "data_freshness": "unknown"
-            },
-            "breakdown": {},
-            "analysis": {}
-        }
+        logger.error(f"Batch demand index calculation error: {e}")
+        for i in remaining:
+            query = queries[i]
+            results[i] = demand_index_error_response(query["company"], query["model"], query["transmission"], query["ownership"])
+
+    return {"results": results, "total": len(results)}
 
 # =========================
 # HEALTH CHECK ENDPOINT
 # =========================
 @app.get("/health")
 def health_check():
-    if df is None or not isinstance(df, pd.DataFrame):
+    # Read once so the version and load time describe the same model
+    current_model = active_model
+    model_info = {
+        "model_version": current_model.version if current_model is not None else None,
+        "model_loaded_at": current_model.loaded_at if current_model is not None else None,
+        "prediction_engine": current_model.engine if current_model is not None else None,
+        "demand_score_generated_at": demand_score_index.metadata.get("generated_at"),
+        "ready": app_ready.is_set(),
+        "startup": dict(startup_report),
+        "serving_bundle": serving_bundle.summary() if serving_bundle is not None else None
+    }
+
+    # The bundle's catalog stands in for the dataset
+    if serving_bundle is None and (df is None or not isinstance(df, pd.DataFrame)):
         return {
             "status": "unhealthy",
-            "model_loaded": model is not None,
+            "model_loaded": current_model is not None,
+            **model_info,
             "dataset_loaded": False,
             "dataset_rows": 0,
             "dataset_columns": [],
@@ -1158,26 +1629,173 @@ def health_check():
     
     return {
         "status": "healthy",
-        "model_loaded": model is not None,
-        "dataset_loaded": not df.empty,
-        "dataset_rows": len(df) if not df.empty else 0,
-        "dataset_columns": list(df.columns) if not df.empty else [],
+        "model_loaded": current_model is not None,
+        **model_info,
+        "dataset_loaded": df is not None and not df.empty,
+        "dataset_rows": len(df) if df is not None else 0,
+        "dataset_columns": list(df.columns) if df is not None else [],
         "cache_exists": cache_manager is not None
     }
 
+# =========================
+# ADMIN ENDPOINTS
+# =========================
+def check_admin_token(token: Optional[str]):
+    """Admin endpoints do not exist unless ADMIN_TOKEN is set; then they require it in X-Admin-Token"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if token is None or not hmac.compare_digest(token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8")):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+@app.post("/admin/reload-model")
+def admin_reload_model(x_admin_token: Optional[str] = Header(None)):
+    """Load CarPriceModel.pkl again and swap it in once it passes the smoke test (needs ADMIN_TOKEN)"""
+    check_admin_token(x_admin_token)
+
+    if model_reload_lock.locked():
+        raise HTTPException(status_code=409, detail="Model reload already in progress")
+
+    old_version = active_model.version if active_model is not None else None
+    try:
+        new_model = reload_model()
+    except Exception as e:
+        logger.error(f"Model reload failed, keeping version {old_version}: {e}")
+        raise HTTPException(status_code=500, detail=f"Model reload failed: {str(e)}")
+
+    return {
+        "status": "reloaded",
+        "previous_version": old_version,
+        "model_version": new_model.version,
+        "model_loaded_at": new_model.loaded_at,
+        "prediction_engine": new_model.engine
+    }
+
+@app.post("/admin/reload-demand-data")
+def admin_reload_demand_data(x_admin_token: Optional[str] = Header(None)):
+    """Load the demand data again, rebuilding the demand index and its per-company tables (needs ADMIN_TOKEN)"""
+    check_admin_token(x_admin_token)
+
+    try:
+        store = reload_demand_data()
+    except Exception as e:
+        logger.error(f"Demand data reload failed, keeping the current index: {e}")
+        raise HTTPException(status_code=500, detail=f"Demand data reload failed: {str(e)}")
+
+    return {
+        "status": "reloaded",
+        "records": store.size,
+        "groups": len(store.group_bounds),
+        "companies": len(store.company_stats),
+        "cube_cells": demand_cube.size if demand_cube is not None else None
+    }
+
+# =========================
+# METRICS ENDPOINT
+# =========================
+@app.get("/metrics")
+def metrics():
+    return {
+        "prediction_cache": prediction_cache.stats(),
+        "demand_index_cache": demand_index_cache.stats(),
+        "demand_score_cache": demand_score_cache.stats(),
+        "demand_index_single_flight": demand_index_flight.stats(),
+        "demand_score_single_flight": demand_score_flight.stats(),
+        "micro_batcher": micro_batcher.stats() if micro_batcher is not None else {"enabled": False},
+        "inference_pool": inference_pool.stats() if inference_pool is not None else {"enabled": False}
+    }
+
+# =========================
+# DIAGNOSTICS ENDPOINT
+# =========================
+@app.get("/diagnostics/memory")
+def memory_diagnostics():
+    """Memory held by the demand data, plus the process peak RSS"""
+    store = demand_store
+    cube = demand_cube
+    try:
+        import resource
+        # ru_maxrss is in kilobytes on Linux
+        max_rss_bytes = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except (ImportError, OSError):
+        max_rss_bytes = None
+
+    return {
+        "demand_data": store.memory_usage(),
+        "demand_cube": {"cells": cube.size} if cube is not None else None,
+        "process": {"max_rss_bytes": max_rss_bytes}
+    }
+
 # =========================
 # DEMAND SCORE API (Independent Feature)
 # =========================
 DEMAND_SCORE_JSON_PATH = os.path.join(os.path.dirname(__file__), "demand_score/data/generated/demand_score.json")
-demand_score_data = None
+demand_score_index = None
 
-try:
+def load_demand_score_data():
+    """Read and validate demand_score.json and index its scores by key and brand"""
     with open(DEMAND_SCORE_JSON_PATH, 'r') as f:
-        demand_score_data = json.load(f)
-    logger.info(f"✅ Loaded demand score data")
-except Exception as e:
-    logger.warning(f"⚠️ Failed to load demand score data: {e}")
-    demand_score_data = {}
+        data = json.load(f)
+    validate_demand_score_data(data)
+    index = DemandScoreIndex(data)
+    logger.info(f"✅ Loaded demand score data ({len(index)} models, {len(index.best_by_brand)} brands)")
+    return index
+
+def reload_demand_score_data():
+    """Read demand_score.json again, swap in the new index and drop cached /api/demand-score responses.
+
+    Parsing, validation and indexing all happen before the swap, so requests
+    see either the old index or the complete new one.
+    """
+    index = load_demand_score_data()
+    swap_demand_score_index(index)
+    logger.info(f"✅ Swapped in demand scores generated at {index.metadata.get('generated_at')}")
+    return index
+
+def swap_demand_score_index(index):
+    """Publish a new score index under the next generation and drop cached responses"""
+    global demand_score_index, demand_score_generation
+    with demand_score_swap_lock:
+        demand_score_index = index
+        demand_score_generation += 1
+    demand_score_cache.clear()
+
+def demand_score_snapshot():
+    """The current (generation, index), read together"""
+    with demand_score_swap_lock:
+        return demand_score_generation, demand_score_index
+
+# Empty until the startup loader swaps in the real data
+demand_score_index = DemandScoreIndex({})
+# Same role as demand_generation, for /api/demand-score
+demand_score_generation = 0
+demand_score_swap_lock = threading.Lock()
+
+def load_demand_score_artifacts():
+    try:
+        swap_demand_score_index(load_demand_score_data())
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to load demand score data: {e}")
+        raise
+
+if DEMAND_SCORE_WATCH_INTERVAL > 0:
+    demand_score_watcher = FileWatcher(DEMAND_SCORE_JSON_PATH, reload_demand_score_data, DEMAND_SCORE_WATCH_INTERVAL)
+
+@app.post("/admin/reload-demand-score")
+def admin_reload_demand_score(x_admin_token: Optional[str] = Header(None)):
+    """Load demand_score.json again (needs ADMIN_TOKEN)"""
+    check_admin_token(x_admin_token)
+
+    try:
+        index = reload_demand_score_data()
+    except Exception as e:
+        logger.error(f"Demand score reload failed, keeping the current data: {e}")
+        raise HTTPException(status_code=500, detail=f"Demand score reload failed: {str(e)}")
+
+    return {
+        "status": "reloaded",
+        "scores": len(index),
+        "generated_at": index.metadata.get("generated_at")
+    }
 
 @app.get("/api/demand-score")
 def get_demand_score(
@@ -1193,38 +1811,47 @@ def get_demand_score(
     Get demand score for a specific car based on live marketplace data.
     This is an independent feature from the existing Demand Index.
     """
-    if not demand_score_data:
+    generation, index = demand_score_snapshot()
+    if not index.data:
         raise HTTPException(status_code=503, detail="Demand score data not available")
-    
-    brand_norm = brand.lower().strip()
-    model_norm = model.lower().strip()
-    city_norm = city.lower().strip() if city else None
-    
-    # Try to find exact match first
-    key = f"{brand_norm}_{model_norm}_{city_norm}" if city_norm else f"{brand_norm}_{model_norm}_"
-    
-    # Search through available scores (new structure uses "Make Model" format)
-    matched_score = None
-    search_key = f"{brand_norm} {model_norm}"
-    
-    for score_key, score_data in demand_score_data.get("scores", {}).items():
-        # Case-insensitive matching
-        if score_key.lower() == search_key.lower():
-            matched_score = score_data
-            break
-    
-    if not matched_score:
-        # Try partial matching (brand only)
-        for score_key, score_data in demand_score_data.get("scores", {}).items():
-            if brand_norm in score_key.lower():
-                matched_score = score_data
-                break
-    
-    if not matched_score:
+
+    # The score only depends on brand and model; the rest is echoed in the metadata.
+    # Misses are cached as {} so unknown cars skip the scan too.
+    cache_key = (generation, normalize_string(brand), normalize_string(model))
+    cached = demand_score_cache.get(cache_key)
+    if cached is None:
+        def compute():
+            response = demand_score_response(index, brand, model) or {}
+            demand_score_cache.set(cache_key, response)
+            return response
+        cached = demand_score_flight.do(cache_key, compute)
+    if not cached:
         raise HTTPException(
             status_code=404, 
             detail=f"No demand data found for {brand} {model}"
         )
+
+    return {
+        **cached,
+        "metadata": {
+            "brand": brand,
+            "model": model,
+            "variant": variant,
+            "city": city,
+            "year": year,
+            "fuel": fuel,
+            "transmission": transmission,
+            "dataFreshness": index.metadata.get("generated_at", "Unknown")
+        }
+    }
+
+def demand_score_response(index: DemandScoreIndex, brand, model):
+    """Match brand/model against the scores and build the response body (without metadata), or None"""
+    # Exact "Make Model" key first, then the brand's most-listed model
+    matched_score = index.lookup(brand, model)
+    
+    if not matched_score:
+        return None
     
     # Extract data from new structure
     analytics = matched_score.get("analytics", {})
@@ -1252,16 +1879,6 @@ def get_demand_score(
             "cityPopularity": components.get("geographicPresence", 0),
             "averageAge": analytics.get("averageAge", 0),
             "averageKms": analytics.get("averageKm", 0)
-        },
-        "metadata": {
-            "brand": brand,
-            "model": model,
-            "variant": variant,
-            "city": city,
-            "year": year,
-            "fuel": fuel,
-            "transmission": transmission,
-            "dataFreshness": demand_score_data.get("metadata", {}).get("generated_at", "Unknown")
         }
     }
 
@@ -1275,7 +1892,7 @@ def debug_info():
     
     # Try to manually load dataset and return error if fails
     load_error = None
-    if df.empty:
+    if df is None or df.empty:
         try:
             if os.path.exists(parquet_path):
                 test_df = pd.read_parquet(parquet_path, engine="pyarrow")
@@ -1289,8 +1906,8 @@ def debug_info():
             load_error = f"Error loading dataset manually: {str(e)}"
     
     return {
-        "dataset_loaded": not df.empty,
-        "dataset_rows": len(df) if not df.empty else 0,
+        "dataset_loaded": df is not None and not df.empty,
+        "dataset_rows": len(df) if df is not None else 0,
         "script_directory": script_dir,
         "files_in_directory": os.listdir(script_dir),
         "parquet_exists": os.path.exists(parquet_path),
@@ -1298,10 +1915,148 @@ def debug_info():
         "parquet_path": parquet_path,
         "csv_path": csv_path,
         "cache_manager_exists": cache_manager is not None,
-        "model_loaded": model is not None,
+        "model_loaded": active_model is not None,
         "load_error": load_error
     }
 
+# =========================
+# SERVING BUNDLE
+# =========================
+serving_bundle = None
+
+def bundle_sources():
+    """Source files the serving bundle is built from and checked against"""
+    return {
+        "model": MODEL_PATH,
+        "feature_names": FEATURE_NAMES_PATH,
+        "companies": COMPANIES_JSON_PATH,
+        "company_models": MODELS_JSON_PATH,
+        "demand_data": DEMAND_DATA_NPZ_PATH,
+        "dataset": DATASET_PARQUET_PATH,
+    }
+
+def open_serving_bundle():
+    """Map the serving bundle if it exists and matches the source files, else return None"""
+    if not os.path.exists(SERVING_BUNDLE_PATH):
+        return None
+    try:
+        bundle = ServingBundle.load(SERVING_BUNDLE_PATH)
+        stale = bundle.stale_sources(bundle_sources())
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to open serving bundle, loading the source files instead: {e}")
+        return None
+    if stale:
+        logger.warning(
+            f"⚠️ Serving bundle built at {bundle.built_at} is stale ({', '.join(stale)} changed); "
+            f"loading the source files instead. Rebuild it with build_serving_bundle.py"
+        )
+        return None
+    logger.info(f"✅ Opened serving bundle built at {bundle.built_at} (model {bundle.model_version})")
+    return bundle
+
+def load_model_from_bundle():
+    global active_model
+    active_model = serving_bundle.model_state(PREDICTION_ENGINE)
+    prediction_cache.clear()
+    logger.info(f"Model loaded from serving bundle (version {active_model.version}, engine {active_model.engine})")
+
+def load_demand_from_bundle():
+    swap_demand_data(serving_bundle.demand_store(), serving_bundle.demand_cube())
+    logger.info(f"✅ Memory-mapped {demand_store.size} demand records from serving bundle")
+
+def load_companies_from_bundle():
+    global companies_data
+    companies_data = serving_bundle.catalog["companies"]
+
+def load_company_models_from_bundle():
+    global company_models_data
+    company_models_data = serving_bundle.catalog["company_models"]
+
+def load_catalog_from_bundle():
+    """Dataset-derived dropdown values, so the dataset itself is never read"""
+    global companies_cache, models_cache, transmissions_cache, owners_cache
+    dataset = serving_bundle.catalog["dataset"]
+    companies_cache = dataset["companies"]
+    models_cache = dataset["models"]
+    transmissions_cache = dataset["transmissions"]
+    owners_cache = dataset["owners"]
+
+# =========================
+# STARTUP
+# =========================
+# Independent loads run concurrently; the app is ready once the critical ones are in
+STARTUP_LOADERS = {
+    "model": load_model_artifact,
+    "demand_data": load_demand_artifacts,
+    "companies": load_companies_data,
+    "company_models": load_company_models_data,
+    "dataset": load_dataset_artifacts,
+    "demand_score": load_demand_score_artifacts,
+}
+# Same artifacts, read from the serving bundle
+BUNDLE_LOADERS = {
+    "model": load_model_from_bundle,
+    "demand_data": load_demand_from_bundle,
+    "companies": load_companies_from_bundle,
+    "company_models": load_company_models_from_bundle,
+    "dataset": load_catalog_from_bundle,
+    "demand_score": load_demand_score_artifacts,
+}
+# Prediction and demand scoring need these; the company catalogs are small and their endpoints fall back to the dataset
+CRITICAL_ARTIFACTS = ("model", "demand_data")
+
+# Per-artifact status and load time, filled in as loads finish
+startup_report: Dict[str, Dict[str, Any]] = {}
+app_ready = threading.Event()
+
+def run_loader(name: str, loader) -> bool:
+    """Run one startup loader, recording its status and duration"""
+    startup_report[name] = {"status": "loading", "seconds": None}
+    start = time.perf_counter()
+    try:
+        loader()
+        status = "loaded"
+    except Exception as e:
+        logger.error(f"❌ Loading {name} failed: {e}")
+        status = "failed"
+    elapsed = time.perf_counter() - start
+    startup_report[name] = {"status": status, "seconds": round(elapsed, 3)}
+    logger.info(f"{'✅' if status == 'loaded' else '⚠️'} {name} {status} in {elapsed:.2f}s")
+    return status == "loaded"
+
+async def load_artifacts():
+    """Load every artifact in a thread pool and wait for the critical ones.
+
+    Artifacts come from the serving bundle when it is fresh, else from their
+    source files. The rest (company catalogs, dataset, demand scores) keep
+    loading in the background after startup; their endpoints report missing
+    data until then.
+    """
+    global serving_bundle
+    start = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=len(STARTUP_LOADERS), thread_name_prefix="startup")
+    serving_bundle = await loop.run_in_executor(executor, open_serving_bundle)
+    loaders = BUNDLE_LOADERS if serving_bundle is not None else STARTUP_LOADERS
+    tasks = {name: loop.run_in_executor(executor, run_loader, name, loader) for name, loader in loaders.items()}
+    executor.shutdown(wait=False)
+
+    critical = await asyncio.gather(*(tasks[name] for name in CRITICAL_ARTIFACTS))
+    if all(critical):
+        app_ready.set()
+        logger.info(f"✅ Critical artifacts loaded in {time.perf_counter() - start:.2f}s, app is ready")
+    else:
+        failed = [name for name, ok in zip(CRITICAL_ARTIFACTS, critical) if not ok]
+        logger.error(f"❌ Critical artifacts failed to load: {failed}; /ready will report 503")
+
+@app.get("/ready")
+def readiness():
+    """Readiness probe: 200 once the critical artifacts are loaded, 503 before"""
+    body = {"ready": app_ready.is_set(), "artifacts": dict(startup_report)}
+    if not body["ready"]:
+        raise HTTPException(status_code=503, detail=body)
+    return body
+
 # =========================
 # HOME ENDPOINT  
 # =========================
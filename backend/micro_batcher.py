@@ -0,0 +1,154 @@
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """Collects concurrent single-row predictions into one vectorized predict call.
+
+    Callers (FastAPI threadpool workers) submit an input row and block on a
+    Future. A background thread drains the queue until it has ``max_batch_size``
+    rows or ``max_wait_ms`` has passed since the first row arrived, runs
+    ``predict_fn`` once on the whole batch and resolves each caller's Future.
+    """
+
+    def __init__(self, predict_fn: Callable[[List[Dict[str, Any]]], Any],
+                 max_batch_size: int = 32, max_wait_ms: float = 5.0, delay_samples: int = 1000):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._stats_lock = threading.Lock()
+        self._batch_size_histogram: Dict[int, int] = {}
+        self._queue_delays_ms = deque(maxlen=delay_samples)
+        self.batches = 0
+        self.items = 0
+        self.max_queue_delay_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the background batching thread"""
+        if self.running:
+            return
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+        logger.info(f"✅ Micro-batcher started (max batch {self.max_batch_size}, max wait {self.max_wait_ms} ms)")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Finish queued work and stop the background thread"""
+        if not self.running:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+        logger.info("Micro-batcher stopped")
+
+    def submit(self, input_data: Dict[str, Any]) -> Future:
+        """Queue one input row and return a Future for its prediction"""
+        future: Future = Future()
+        self._queue.put((input_data, future, time.perf_counter()))
+        return future
+
+    def predict(self, input_data: Dict[str, Any], timeout: Optional[float] = 30.0):
+        """Submit one row and wait for its prediction"""
+        return self.submit(input_data).result(timeout)
+
+    def _collect_batch(self, first) -> tuple:
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait_ms / 1000.0
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch, stopping = self._collect_batch(first)
+            self._process(batch)
+
+        # Drain anything queued behind the stop sentinel
+        leftover = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                leftover.append(item)
+        for start in range(0, len(leftover), self.max_batch_size):
+            self._process(leftover[start:start + self.max_batch_size])
+
+    def _process(self, batch: List[tuple]) -> None:
+        started = time.perf_counter()
+        self._record(len(batch), [(started - submitted) * 1000.0 for _, _, submitted in batch])
+
+        try:
+            predictions = self.predict_fn([input_data for input_data, _, _ in batch])
+        except Exception as e:
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+        for (_, future, _), prediction in zip(batch, predictions):
+            future.set_result(prediction)
+
+    def _record(self, batch_size: int, delays_ms: List[float]) -> None:
+        # Power-of-two buckets: 1, 2, 4, 8, ...
+        bucket = 1
+        while bucket < batch_size:
+            bucket *= 2
+        with self._stats_lock:
+            self.batches += 1
+            self.items += batch_size
+            self._batch_size_histogram[bucket] = self._batch_size_histogram.get(bucket, 0) + 1
+            self._queue_delays_ms.extend(delays_ms)
+            self.max_queue_delay_ms = max(self.max_queue_delay_ms, max(delays_ms))
+
+    def stats(self) -> Dict[str, Any]:
+        """Return batch-size distribution and queueing delay metrics"""
+        with self._stats_lock:
+            delays = sorted(self._queue_delays_ms)
+            histogram = {f"<={size}": count for size, count in sorted(self._batch_size_histogram.items())}
+            batches, items, max_delay = self.batches, self.items, self.max_queue_delay_ms
+
+        def percentile(p):
+            return round(delays[min(len(delays) - 1, int(p * len(delays)))], 3) if delays else 0.0
+
+        return {
+            "running": self.running,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "queue_depth": self._queue.qsize(),
+            "batches": batches,
+            "items": items,
+            "avg_batch_size": round(items / batches, 2) if batches else 0.0,
+            "batch_size_histogram": histogram,
+            "queue_delay_ms": {
+                "avg": round(sum(delays) / len(delays), 3) if delays else 0.0,
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": round(max_delay, 3)
+            }
+        }
@@ -0,0 +1,164 @@
+import hashlib
+import logging
+import os
+import pickle
+from datetime import datetime
+
+import numpy as np
+
+from feature_encoder import FeatureEncoder
+from forest_engine import FlatForest, LeafValueTable
+
+logger = logging.getLogger(__name__)
+
+# Row used to check a freshly loaded model before it starts serving
+SMOKE_TEST_ROW = {
+    "company": "maruti",
+    "car_model": "swift",
+    "year": 2018,
+    "kms_driven": 40000.0,
+    "fuel_type": "petrol",
+    "transmission": "manual",
+    "owners": 1,
+    "service_history": False,
+    "previous_accidents": False,
+    "insurance": "unknown"
+}
+
+
+class LoadedModel:
+    """A model together with everything derived from it.
+
+    Requests take one reference to this object and use it throughout, so
+    swapping the module-level reference never mixes an old model with a new encoder.
+    """
+
+    def __init__(self, model, encoder, flat_forest=None, leaf_value_table=None, version="unknown", path=None):
+        self.model = model
+        self.encoder = encoder
+        self.flat_forest = flat_forest
+        self.leaf_value_table = leaf_value_table
+        self.version = version
+        self.path = path
+        self.loaded_at = datetime.now().isoformat()
+
+    @property
+    def engine(self) -> str:
+        return "flat" if self.flat_forest is not None else "sklearn"
+
+    def predict_matrix(self, X):
+        """Run the inference engine on an encoded feature matrix"""
+        if self.flat_forest is not None:
+            return self.flat_forest.predict(X)
+        return self.model.predict(X)
+
+    def predict_trees(self, X):
+        """Return every tree's output as a (n_rows, n_trees) matrix"""
+        if self.flat_forest is not None:
+            return self.flat_forest.predict_trees(X)
+        if self.leaf_value_table is not None:
+            return self.leaf_value_table.predict_trees(self.model, X)
+        raise ValueError("Prediction intervals require a tree ensemble model")
+
+
+def file_version(path: str) -> str:
+    """Short content hash identifying a model file"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+# Precompile the one-hot layout once so requests skip get_dummies/reindex
+def build_feature_encoder(model, feature_names_path=None):
+    """Build the feature encoder from the model, falling back to feature_names.pkl"""
+    if model is not None and hasattr(model, "feature_names_in_"):
+        return FeatureEncoder.from_model(model)
+    if feature_names_path and os.path.exists(feature_names_path):
+        return FeatureEncoder.from_pickle(feature_names_path)
+    return None
+
+
+def verification_rows(encoder, n_rows: int = 64) -> list:
+    """SMOKE_TEST_ROW plus fixed, properly one-hot rows that between them use every dummy column"""
+    rng = np.random.default_rng(42)
+    categories = {field: sorted(offsets) for field, offsets in encoder.category_offsets.items()}
+    n_rows = max([n_rows] + [len(values) for values in categories.values()])
+    rows = [SMOKE_TEST_ROW]
+    for i in range(n_rows):
+        row = {
+            "year": int(rng.integers(2000, 2025)),
+            "kms_driven": float(rng.integers(0, 250000)),
+            "owners": int(rng.integers(1, 5)),
+            "service_history": bool(i % 2),
+            "previous_accidents": i % 3 == 0,
+        }
+        for field, values in categories.items():
+            row[field] = values[i % len(values)] if values else "unknown"
+        rows.append(row)
+    return rows
+
+
+def _forest_matches(forest, model, encoder) -> bool:
+    # Every tree must reach the same leaf value as sklearn's, bit for bit; the forest average
+    # may differ in the last bits because sklearn adds the trees up in whatever order its threads finish
+    X = encoder.encode_many(verification_rows(encoder))
+    expected_trees = np.column_stack([estimator.predict(X) for estimator in model.estimators_])
+    return (np.array_equal(forest.predict_trees(X), expected_trees)
+            and np.allclose(forest.predict(X), model.predict(X), rtol=1e-9, atol=1e-6))
+
+
+def build_flat_forest(model, encoder, forest_path=None, forest=None):
+    """Load (or build) the flattened forest and verify it against model.predict.
+
+    A prebuilt `forest` (e.g. from the serving bundle) is used instead of forest_path if given.
+    """
+    if forest is None and forest_path and os.path.exists(forest_path):
+        forest = FlatForest.load(forest_path)
+    if forest is not None:
+        if (forest.n_trees == len(model.estimators_) and forest.n_features == model.n_features_in_
+                and _forest_matches(forest, model, encoder)):
+            return forest
+        logger.warning("⚠️ Flattened forest does not match the loaded model, rebuilding it in memory")
+
+    forest = FlatForest.from_model(model)
+    if not _forest_matches(forest, model, encoder):
+        raise ValueError("Flattened forest predictions differ from model.predict")
+    return forest
+
+
+def load_model_state(model_path, feature_names_path=None, forest_path=None, engine="sklearn") -> LoadedModel:
+    """Load a model file, build its encoder and engine, and smoke-test the result"""
+    version = file_version(model_path)
+    with open(model_path, "rb") as f:
+        model = pickle.load(f)
+
+    encoder = build_feature_encoder(model, feature_names_path)
+    if encoder is None:
+        raise ValueError("Model has no feature names and feature_names.pkl is missing")
+
+    flat_forest = None
+    if engine == "flat":
+        try:
+            flat_forest = build_flat_forest(model, encoder, forest_path)
+        except Exception as e:
+            logger.error(f"Error building flat forest, falling back to sklearn: {e}")
+
+    return prepare_model_state(model, encoder, flat_forest, version, model_path)
+
+
+def prepare_model_state(model, encoder, flat_forest=None, version="unknown", path=None) -> LoadedModel:
+    """Wrap an unpickled model with its encoder and engine, and smoke-test the result"""
+    # Interval mode reads per-tree outputs from the flat forest, or from model.apply() plus this table
+    leaf_value_table = None
+    if flat_forest is None and hasattr(model, "estimators_"):
+        leaf_value_table = LeafValueTable(model)
+
+    state = LoadedModel(model, encoder, flat_forest, leaf_value_table, version=version, path=path)
+
+    prediction = state.predict_matrix(encoder.encode_many([SMOKE_TEST_ROW]))[0]
+    if not np.isfinite(prediction):
+        raise ValueError(f"Smoke test prediction is not finite: {prediction}")
+
+    return state
@@ -0,0 +1,64 @@
+import os
+import struct
+import zipfile
+from typing import Dict
+
+import numpy as np
+
+# Fixed-size part of a zip local file header; name and extra lengths are its last two fields
+LOCAL_HEADER_SIZE = 30
+
+HEADER_READERS = {
+    (1, 0): np.lib.format.read_array_header_1_0,
+    (2, 0): np.lib.format.read_array_header_2_0,
+}
+
+
+def save_npz(path: str, arrays: Dict[str, np.ndarray]) -> None:
+    """Write an uncompressed .npz next to `path` and move it into place.
+
+    Readers that memory-mapped the old file keep their view of it.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+
+
+def load_npz(path: str) -> Dict[str, np.ndarray]:
+    """Memory-map every array of an uncompressed .npz in place.
+
+    np.load() ignores mmap_mode for .npz files, so this finds each member's
+    data offset from its zip and .npy headers and maps it with np.memmap.
+    """
+    with zipfile.ZipFile(path) as zf:
+        members = zf.infolist()
+
+    arrays = {}
+    with open(path, "rb") as f:
+        for member in members:
+            if member.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{path}: {member.filename} is compressed and cannot be memory-mapped")
+
+            f.seek(member.header_offset)
+            name_length, extra_length = struct.unpack("<HH", f.read(LOCAL_HEADER_SIZE)[26:30])
+            f.seek(member.header_offset + LOCAL_HEADER_SIZE + name_length + extra_length)
+
+            version = np.lib.format.read_magic(f)
+            if version not in HEADER_READERS:
+                raise ValueError(f"{path}: unsupported .npy format version {version} in {member.filename}")
+            shape, fortran_order, dtype = HEADER_READERS[version](f)
+            if dtype.hasobject:
+                raise ValueError(f"{path}: {member.filename} holds Python objects")
+
+            name = member.filename[:-4] if member.filename.endswith(".npy") else member.filename
+            if not shape or 0 in shape:
+                # np.memmap cannot map scalars or empty arrays, and they are tiny anyway
+                count = int(np.prod(shape))
+                arrays[name] = np.fromfile(f, dtype=dtype, count=count).reshape(shape)
+            else:
+                arrays[name] = np.memmap(
+                    path, dtype=dtype, mode="r", offset=f.tell(), shape=shape,
+                    order="F" if fortran_order else "C"
+                )
+    return arrays
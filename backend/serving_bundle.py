@@ -0,0 +1,156 @@
+import json
+import logging
+import os
+import pickle
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from demand_cube import DemandCube
+from demand_store import DemandStore
+from feature_encoder import FeatureEncoder
+from forest_engine import FlatForest
+from model_loader import LoadedModel, build_flat_forest, file_version, prepare_model_state
+from npz_mmap import load_npz, save_npz
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever the layout below changes; older bundles are ignored
+BUNDLE_FORMAT = 1
+
+# Bundle layout (one uncompressed .npz, memory-mapped on load):
+#   manifest         JSON: format, build time, model version, size/mtime/hash of every source file
+#   catalog          JSON: companies.json, company_models.json and the dataset's dropdown values
+#   model/pickle     the model file's bytes
+#   model/feature_names, forest/*, demand/*, cube/*
+#                    encoder columns, flattened forest, DemandStore and DemandCube arrays
+
+
+def pack_json(value) -> np.ndarray:
+    return np.frombuffer(json.dumps(value).encode("utf-8"), dtype=np.uint8)
+
+
+def unpack_json(array: np.ndarray):
+    return json.loads(array.tobytes().decode("utf-8"))
+
+
+def source_signature(path: str) -> Dict[str, Any]:
+    """Size, mtime and content hash of a bundle source file"""
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "version": file_version(path)}
+
+
+def save_bundle(path: str, sources: Dict[str, str], feature_names: List[str], catalog: Dict[str, Any],
+                store: DemandStore, cube_arrays: Dict[str, np.ndarray],
+                forest: Optional[FlatForest] = None) -> Dict[str, Any]:
+    """Write the serving bundle and return its manifest.
+
+    `sources` maps source names to file paths; "model" is copied in byte
+    for byte, and every existing source is fingerprinted in the manifest.
+    """
+    with open(sources["model"], "rb") as f:
+        model_bytes = f.read()
+
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "built_at": datetime.now().isoformat(),
+        "sources": {name: source_signature(source) for name, source in sources.items() if os.path.exists(source)},
+    }
+    manifest["model_version"] = manifest["sources"]["model"]["version"]
+
+    arrays = {
+        "manifest": pack_json(manifest),
+        "catalog": pack_json(catalog),
+        "model/pickle": np.frombuffer(model_bytes, dtype=np.uint8),
+        "model/feature_names": np.array(feature_names, dtype=str),
+    }
+    if forest is not None:
+        arrays.update({f"forest/{name}": array for name, array in forest.to_arrays().items()})
+    arrays.update({f"demand/{name}": array for name, array in store.to_arrays().items()})
+    arrays.update({f"cube/{name}": array for name, array in cube_arrays.items()})
+    save_npz(path, arrays)
+    return manifest
+
+
+class ServingBundle:
+    """Memory-mapped view of a bundle written by save_bundle().
+
+    Opening it only maps the file and parses the manifest and catalog; the
+    model, demand store and cube are built from the mapped arrays on demand.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray], path: Optional[str] = None):
+        self.path = path
+        self.arrays = arrays
+        self.manifest: Dict[str, Any] = unpack_json(arrays["manifest"])
+        if self.manifest.get("format") != BUNDLE_FORMAT:
+            raise ValueError(f"unsupported serving bundle format {self.manifest.get('format')} (expected {BUNDLE_FORMAT})")
+        self.catalog: Dict[str, Any] = unpack_json(arrays["catalog"])
+
+    @classmethod
+    def load(cls, path: str) -> "ServingBundle":
+        return cls(load_npz(path), path)
+
+    @property
+    def built_at(self) -> str:
+        return self.manifest["built_at"]
+
+    @property
+    def model_version(self) -> str:
+        return self.manifest["model_version"]
+
+    def section(self, prefix: str) -> Dict[str, np.ndarray]:
+        """Arrays stored under `prefix/`, keyed by the rest of their name"""
+        start = len(prefix) + 1
+        return {name[start:]: array for name, array in self.arrays.items() if name.startswith(f"{prefix}/")}
+
+    def stale_sources(self, sources: Dict[str, str]) -> List[str]:
+        """Names of source files whose content differs from what the bundle was built from.
+
+        Files with the recorded size and mtime are trusted without hashing;
+        missing files are skipped so a deployment can ship the bundle alone.
+        """
+        stale = []
+        for name, recorded in self.manifest["sources"].items():
+            path = sources.get(name)
+            if path is None or not os.path.exists(path):
+                continue
+            stat = os.stat(path)
+            if stat.st_size == recorded["size"] and stat.st_mtime_ns == recorded["mtime_ns"]:
+                continue
+            if file_version(path) != recorded["version"]:
+                stale.append(name)
+        return stale
+
+    def model_state(self, engine: str = "sklearn") -> LoadedModel:
+        """Unpickle the bundled model with its prebuilt encoder (and flattened forest for the flat engine)"""
+        model = pickle.loads(self.arrays["model/pickle"])
+        encoder = FeatureEncoder(self.arrays["model/feature_names"].tolist())
+
+        flat_forest = None
+        if engine == "flat":
+            forest_arrays = self.section("forest")
+            try:
+                forest = FlatForest.from_arrays(forest_arrays) if forest_arrays else None
+                flat_forest = build_flat_forest(model, encoder, forest=forest)
+            except Exception as e:
+                logger.error(f"Error building flat forest, falling back to sklearn: {e}")
+
+        return prepare_model_state(model, encoder, flat_forest, self.model_version, self.path)
+
+    def demand_store(self) -> DemandStore:
+        return DemandStore.from_arrays(self.section("demand"))
+
+    def demand_cube(self) -> Optional[DemandCube]:
+        cube_arrays = self.section("cube")
+        return DemandCube(cube_arrays) if cube_arrays else None
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "format": BUNDLE_FORMAT,
+            "built_at": self.built_at,
+            "model_version": self.model_version,
+            "sources": {name: recorded["version"] for name, recorded in self.manifest["sources"].items()},
+        }
@@ -0,0 +1,55 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one computation.
+
+    The first caller for a key runs ``fn``; callers that arrive while it is
+    still running wait on its Future and get the same result (or exception)
+    instead of computing it again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Return fn()'s result, sharing it with concurrent callers of the same key"""
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                future = Future()
+                self._in_flight[key] = future
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return computations run and computations saved by sharing a result"""
+        with self._lock:
+            return {
+                "in_flight": len(self._in_flight),
+                "executions": self.executions,
+                "saved_computations": self.coalesced
+            }
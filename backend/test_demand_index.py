@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from benchmark_demand_index import DEMAND_DATA_JSON_PATH, build_queries, legacy_demand_index
+from demand_cube import DemandCube, build_cube
+from demand_store import DemandStore, ModelNameIndex
+
+
+def record(**fields):
+    return {"company": "maruti", "car_model": "swift", "year": 2018, "owners": 1, "fuel_type": "petrol",
+            "transmission": "manual", "kms_driven": 40000.0, "price": 500000.0, **fields}
+
+
+@pytest.fixture(scope="module")
+def demand_data():
+    with open(DEMAND_DATA_JSON_PATH, 'r') as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="module")
+def queries(demand_data):
+    # Exact, filtered, fuzzy and year-bounded queries for the first pairs, plus the unknown ones
+    return build_queries(demand_data)[:500] + build_queries(demand_data)[-3:]
+
+
+@pytest.fixture(scope="module")
+def store(demand_data):
+    return DemandStore.from_records(demand_data)
+
+
+@pytest.fixture(scope="module")
+def cube(store):
+    return DemandCube(build_cube(store, "test"))
+
+
+def test_store_matches_legacy_scans(demand_data, queries, store):
+    fuzzy = 0
+    for query in queries:
+        actual = store.demand_index(*query)
+        # Fuzzy matches pick one ranked model instead of every model containing the first word
+        if "matched_model" in actual:
+            fuzzy += 1
+            continue
+        assert actual == legacy_demand_index(demand_data, *query, similar_models=False), query
+    assert fuzzy < len(queries) // 2
+
+    # Batched lookups and a reloaded store give the same responses
+    fields = ('company', 'model', 'transmission', 'ownership', 'year', 'fuel_type', 'year_min', 'year_max')
+    batch = store.demand_index_many([dict(zip(fields, query)) for query in queries])
+    reloaded = DemandStore.from_arrays(store.to_arrays())
+    for query, response in zip(queries, batch):
+        assert response == store.demand_index(*query) == reloaded.demand_index(*query), query
+
+
+def test_cube_matches_store(queries, store, cube):
+    answered = 0
+    for query in queries:
+        # The cube has no year_min/year_max dimension
+        if len(query) > 6:
+            continue
+        response = cube.demand_index(*query)
+        if response is not None:
+            answered += 1
+            assert response == store.demand_index(*query), query
+    assert answered > 0
+
+
+def test_cube_leaves_any_codes_to_the_store(demand_data, cube):
+    # -1 is the cube's "any" roll-up key, so these must not hit the unfiltered cell
+    car = demand_data[0]
+    assert cube.lookup(car["company"], car["car_model"]) is not None
+    assert cube.lookup(car["company"], car["car_model"], ownership="-1") is None
+    assert cube.lookup(car["company"], car["car_model"], year=-1) is None
+
+
+def test_blank_model_names_are_not_fuzzy_candidates():
+    assert ModelNameIndex({0: "", 1: "swift", 2: None}, {}).search("a   b") == []
+    assert ModelNameIndex({0: "", 1: "swift"}, {}).search("   ") == []
+
+    store = DemandStore.from_records([record(), record(car_model="")])
+    response = store.demand_index("maruti", "swiftt")
+    assert response["matched_model"] == "swift"
+    assert store.demand_index("maruti", "a   b")["demand_index"] == 50.0
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from demand_store import DemandStore
+
+
+def record(**fields):
+    return {"company": "maruti", "car_model": "swift", "year": 2018, "owners": 1, "fuel_type": "petrol",
+            "transmission": "manual", "kms_driven": 40000.0, "price": 500000.0, **fields}
+
+
+def test_out_of_range_years_and_owners_widen_instead_of_wrapping():
+    store = DemandStore.from_records([record(), record(year=40000, owners=300), record(year=None, owners=None)])
+    assert store.year.dtype == np.int32 and store.owners.dtype == np.int16
+    assert sorted(store.year.tolist()) == [0, 2018, 40000]
+    assert store.demand_index("maruti", "swift", ownership="300", year=40000)["metrics"]["matches_count"] == 1
+
+    # Data that fits keeps the narrow types
+    store = DemandStore.from_records([record(), record(year=None, owners=None)])
+    assert store.year.dtype == np.int16 and store.owners.dtype == np.int8
+
+    with pytest.raises(ValueError):
+        DemandStore.from_records([record(year=float("inf"))])
+
+
+def test_fuzzy_match_only_for_unknown_models_and_keeps_filters():
+    store = DemandStore.from_records(
+        [record()] * 3 + [record(fuel_type="diesel")] + [record(car_model="swift dzire")] * 5 + [record(car_model="alto")] * 2
+    )
+
+    # A known model whose filters match nothing falls back to the company, not to its own unfiltered rows
+    response = store.demand_index("maruti", "swift", year=1990)
+    assert "matched_model" not in response and response["demand_index"] == 50.0
+
+    # An unknown model borrows the closest model's rows with the same filters applied
+    response = store.demand_index("maruti", "swiftt", fuel_type="diesel")
+    assert response["matched_model"] == "swift" and response["metrics"]["matches_count"] == 1
+    assert store.demand_index("maruti", "swiftt", fuel_type="cng")["demand_index"] == 50.0
@@ -0,0 +1,68 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from feature_encoder import FeatureEncoder
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+CLEANED_DATA_PATH = os.path.join(script_dir, "cleaned_training_data.csv")
+CATEGORICAL_COLUMNS = ["company", "car_model", "fuel_type", "transmission", "insurance"]
+
+
+@pytest.fixture(scope="module")
+def training_rows():
+    data = pd.read_csv(CLEANED_DATA_PATH).dropna(subset=["year", "kms_driven", "owners"])
+    return data.drop(columns="price")
+
+
+@pytest.fixture(scope="module")
+def feature_names(training_rows):
+    """Columns laid out the way train_combined_model.py encodes them"""
+    return pd.get_dummies(training_rows, columns=CATEGORICAL_COLUMNS, drop_first=True).columns.tolist()
+
+
+def legacy_encode(feature_names, input_data):
+    """The original /predict encoding path: get_dummies on one request, then reindex"""
+    X = pd.get_dummies(pd.DataFrame([input_data]))
+    return X.reindex(columns=feature_names, fill_value=0).to_numpy(dtype=np.float64)
+
+
+def assert_matches_legacy(feature_names, rows):
+    encoder = FeatureEncoder(feature_names)
+    expected = np.vstack([legacy_encode(feature_names, row) for row in rows])
+    assert np.array_equal(encoder.encode_many(rows), expected)
+    for row, expected_row in zip(rows, expected):
+        assert np.array_equal(encoder.encode_many([row])[0], expected_row)
+
+
+def test_matches_legacy_on_training_rows(feature_names, training_rows):
+    rows = training_rows.sample(300, random_state=0)
+    rows = rows.astype({"service_history": bool, "previous_accidents": bool}).to_dict(orient="records")
+    # Includes each field's first category, which drop_first left without a column
+    assert_matches_legacy(feature_names, rows)
+
+
+def test_matches_legacy_on_unknown_categories(feature_names):
+    row = {"company": "maruti", "car_model": "swift", "year": 2018, "kms_driven": 40000.0, "fuel_type": "petrol",
+           "transmission": "manual", "owners": 1, "service_history": True, "previous_accidents": False,
+           "insurance": "unknown"}
+    assert_matches_legacy(feature_names, [
+        row,
+        {**row, "company": "zzz", "car_model": "nope"},
+        {**row, "fuel_type": "hydrogen", "transmission": "cvt", "insurance": "gold"},
+        {**row, "company": "", "car_model": "MARUTI SWIFT"},
+    ])
+
+
+def test_matches_legacy_on_missing_fields(feature_names):
+    row = {"company": "hyundai", "car_model": "i20", "year": 2016, "kms_driven": 52000.0, "fuel_type": "diesel",
+           "transmission": "automatic", "owners": 2, "service_history": False, "previous_accidents": True}
+    assert_matches_legacy(feature_names, [
+        row,
+        {key: value for key, value in row.items() if key not in ("car_model", "transmission")},
+        {key: value for key, value in row.items() if key not in ("kms_driven", "service_history")},
+        {**row, "year": None, "fuel_type": None},
+    ])
+    assert FeatureEncoder(feature_names).encode_many([]).shape == (0, len(feature_names))
@@ -0,0 +1,75 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from feature_encoder import FeatureEncoder
+from forest_engine import FlatForest, LeafValueTable
+from model_loader import _forest_matches, build_flat_forest, verification_rows
+
+pytestmark = pytest.mark.filterwarnings("ignore:X does not have valid feature names")
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+CLEANED_DATA_PATH = os.path.join(script_dir, "cleaned_training_data.csv")
+CATEGORICAL_COLUMNS = ["company", "car_model", "fuel_type", "transmission", "insurance"]
+
+
+def train_forest(data, random_state):
+    """A small forest trained the way train_combined_model.py trains CarPriceModel.pkl"""
+    X = pd.get_dummies(data.drop(columns="price"), columns=CATEGORICAL_COLUMNS, drop_first=True)
+    model = RandomForestRegressor(n_estimators=20, max_depth=12, random_state=random_state, n_jobs=-1)
+    model.fit(X, data["price"])
+    return model
+
+
+@pytest.fixture(scope="module")
+def data():
+    data = pd.read_csv(CLEANED_DATA_PATH).dropna(subset=["year", "kms_driven", "owners", "price"])
+    return data.sample(3000, random_state=0)
+
+
+@pytest.fixture(scope="module")
+def model(data):
+    return train_forest(data, random_state=42)
+
+
+@pytest.fixture(scope="module")
+def encoded_rows(model, data):
+    encoder = FeatureEncoder.from_model(model)
+    rows = data.drop(columns="price").sample(500, random_state=1).to_dict(orient="records")
+    return encoder.encode_many(rows + verification_rows(encoder))
+
+
+def per_tree_predictions(model, X):
+    return np.column_stack([estimator.predict(X) for estimator in model.estimators_])
+
+
+def test_flat_forest_matches_model(model, encoded_rows):
+    forest = FlatForest.from_model(model)
+    assert np.array_equal(forest.predict_trees(encoded_rows), per_tree_predictions(model, encoded_rows))
+    np.testing.assert_allclose(forest.predict(encoded_rows), model.predict(encoded_rows), rtol=1e-12)
+
+    # The arrays the serving bundle and forest_path store rebuild the same forest
+    reloaded = FlatForest.from_arrays(forest.to_arrays())
+    assert np.array_equal(reloaded.predict_trees(encoded_rows), forest.predict_trees(encoded_rows))
+
+
+def test_leaf_value_table_matches_model(model, encoded_rows):
+    table = LeafValueTable(model)
+    tree_outputs = table.predict_trees(model, encoded_rows)
+    assert np.array_equal(tree_outputs, per_tree_predictions(model, encoded_rows))
+    np.testing.assert_allclose(tree_outputs.mean(axis=1), model.predict(encoded_rows), rtol=1e-12)
+
+
+def test_forest_of_another_model_is_rejected(model, data):
+    encoder = FeatureEncoder.from_model(model)
+    other = FlatForest.from_model(train_forest(data, random_state=7))
+    assert other.n_trees == len(model.estimators_) and other.n_features == model.n_features_in_
+    assert not _forest_matches(other, model, encoder)
+
+    # build_flat_forest drops it and flattens the loaded model instead
+    forest = build_flat_forest(model, encoder, forest=other)
+    assert forest is not other
+    assert _forest_matches(forest, model, encoder)
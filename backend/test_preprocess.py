@@ -0,0 +1,122 @@
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+import main
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+CSV_PATH = os.path.join(script_dir, "cars24.csv")
+
+DERIVED_COLUMNS = ["company", "model", "owners_numeric", "owners_str"]
+
+
+def legacy_normalize_string(s):
+    """The original normalize_string from main.py"""
+    if pd.isna(s) or s is None:
+        return ""
+    return str(s).lower().strip()
+
+
+def legacy_extract_numeric_owner(owner_str):
+    """The original per-row owner parser from main.py"""
+    if pd.isna(owner_str):
+        return None
+
+    owner_str = str(owner_str).lower()
+
+    numbers = re.findall(r'\d+', owner_str)
+    if numbers:
+        return int(numbers[0])
+
+    if 'first' in owner_str or '1st' in owner_str:
+        return 1
+    elif 'second' in owner_str or '2nd' in owner_str:
+        return 2
+    elif 'third' in owner_str or '3rd' in owner_str:
+        return 3
+    elif 'fourth' in owner_str or '4th' in owner_str or '4+' in owner_str:
+        return 4
+
+    return None
+
+
+def legacy_derived_columns(df):
+    """company/model/owners_numeric/owners_str as the original apply/lambda code built them"""
+    normalize_string = legacy_normalize_string
+    return {
+        "company": df['Car Name'].apply(
+            lambda x: normalize_string(x.split()[0]) if isinstance(x, str) and len(x.split()) > 0 else "unknown"
+        ),
+        "model": df['Car Name'].apply(
+            lambda x: normalize_string(' '.join(x.split()[1:])) if isinstance(x, str) and len(x.split()) > 1 else "unknown"
+        ),
+        "owners_numeric": df['owners'].apply(legacy_extract_numeric_owner),
+        "owners_str": df['owners'].apply(normalize_string),
+    }
+
+
+def preprocess(raw):
+    """Run main.preprocess_data on raw, checking that raw itself is left untouched"""
+    before = raw.copy()
+    df = main.preprocess_data(raw)
+    pd.testing.assert_frame_equal(raw, before)
+    return df
+
+
+def assert_same_columns(df):
+    legacy = legacy_derived_columns(df)
+    for column in DERIVED_COLUMNS:
+        pd.testing.assert_series_equal(df[column], legacy[column], check_names=False, obj=column)
+
+
+def test_matches_legacy_on_cars24():
+    raw = pd.read_csv(CSV_PATH, engine="python", on_bad_lines="skip", encoding="utf-8")
+    # The same cleanup read_dataset() does before preprocessing
+    raw = raw.loc[:, ~raw.columns.duplicated()].rename(columns={"Unnamed: 0": "index"})
+    df = preprocess(raw)
+    assert_same_columns(df)
+
+
+def test_matches_legacy_on_messy_values():
+    raw = pd.DataFrame({
+        "Car Name": ["Maruti Swift", "  Tata   NEXON  EV ", "Mahindra", "", "   ", "\tKIA\nSeltos", None, "BMW\xa0X1\u3000sDrive20d"],
+        "Owner": ["1st Owner", "Second Owner", "first", "4+ owners", "Fourth", None, "no owner info", 2.0],
+    })
+    df = preprocess(raw)
+    assert_same_columns(df)
+    # Object columns go through Python's re instead of Arrow's RE2
+    df = preprocess(raw.astype(object))
+    assert_same_columns(df)
+    names = df["Car Name"].astype(object)
+    legacy = legacy_derived_columns(df)
+    company, model = main.split_car_names(names)
+    assert company.tolist() == legacy["company"].tolist() and model.tolist() == legacy["model"].tolist()
+
+    raw["Owner"] = [1, 2, 3, 4, 1, 2, 3, 2]
+    df = preprocess(raw)
+    assert_same_columns(df)
+    assert df["owners_numeric"].dtype == np.int64
+
+    # No name with a model part at all
+    raw["Car Name"] = ["Maruti", "Tata", "Kia", "", " ", "Mg", "Jeep", "Bmw"]
+    df = preprocess(raw)
+    assert_same_columns(df)
+
+
+def test_load_dataset_publishes_only_the_preprocessed_frame(monkeypatch):
+    seen = []
+    preprocess_data = main.preprocess_data
+
+    def recording_preprocess(data):
+        seen.append(main.df)
+        return preprocess_data(data)
+
+    monkeypatch.setattr(main, "df", None)
+    monkeypatch.setattr(main, "preprocess_data", recording_preprocess)
+    assert main.load_dataset()
+    # Readers never see the raw frame while it is being preprocessed
+    assert seen == [None]
+    assert {"company", "model", "owners_numeric", "owners_str"} <= set(main.df.columns)
+